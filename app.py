@@ -1,4 +1,5 @@
 from flask import Flask, request, jsonify, render_template, send_from_directory, redirect, url_for, send_file
+import multiprocessing
 import os
 import sqlite3
 import time
@@ -6,12 +7,10 @@ import re
 from werkzeug.utils import secure_filename
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from resume_parser import ResumeParserService
-from cossimilarity import SimilarityCalculator
-from matching import MatchingService
-from interview_scheduler import InterviewScheduler
-from password import send_otp, generate_candidate_id, store_candidate_data
-from threading import Thread
+from password import send_otp
+from schedule_migration import ensure_schedule_columns
+from warmup import Warmup
+import db
 
 app = Flask(
     __name__,
@@ -22,17 +21,48 @@ app = Flask(
 limiter = Limiter(app=app, key_func=get_remote_address)
 
 otp_storage = {}
-DB_PATH = r"C:\Users\Sudhindra Prakash\Desktop\java project\.venv\Backend\DRDO_Normalized_Updated_Names.db"
 UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Global scheduler instance for caching
-scheduler = InterviewScheduler()
+# sklearn/pandas, pyresparser/spaCy and the scheduler's score matrices load in the background,
+# so routes that don't need them are served while they warm up
+SIGNUP_WARMUP_TIMEOUT = 30
+# Field partitions of /compute_schedule are solved on this many processes
+SCHEDULE_WORKERS = int(os.getenv("SCHEDULE_WORKERS", os.cpu_count() or 1))
+# Signup resumes are parsed on this many processes, each holding its own warm NLP models
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 2))
+
+def load_resume_parser():
+    from resume_parser import ResumeParserService
+    return ResumeParserService
+
+def load_scheduler():
+    from interview_scheduler import InterviewScheduler
+    from slot_calendar import DriveWindow
+    window = DriveWindow(
+        start_date=os.getenv("DRIVE_START_DATE", "2025-05-01"),
+        end_date=os.getenv("DRIVE_END_DATE", "2025-05-05")
+    )
+    return InterviewScheduler(window)
+
+def load_scheduling_worker():
+    from scheduling_worker import SchedulingWorker
+    scheduler = warmup.get("scheduler")
+    if scheduler is None:
+        raise RuntimeError("scheduler is not available")
+    return SchedulingWorker(scheduler, change_consumer=scheduler.change_log).start()
+
+def load_resume_jobs():
+    from resume_jobs import ResumeJobService
+    scheduling_worker = warmup.get("scheduling_worker")
+    if scheduling_worker is None:
+        raise RuntimeError("scheduling worker is not available")
+    return ResumeJobService(scheduling_worker, PARSE_WORKERS, UPLOAD_FOLDER)
 
 def init_db():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    os.makedirs(os.path.dirname(db.DB_PATH), exist_ok=True)
     try:
-        with sqlite3.connect(DB_PATH, timeout=10) as conn:
+        with db.connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS Interviewee (
@@ -70,19 +100,50 @@ def init_db():
                     Interviewer_ID TEXT,
                     Interviewee_ID TEXT,
                     date TEXT,
-                    time TEXT
+                    time TEXT,
+                    Interviewer_Email TEXT,
+                    Interviewee_Email TEXT
                 )
             """)
             # Add indexes for optimization
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_interviewee_id ON Interviewee(interviewee_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_interviewee_interests ON Interviewee_Interests(interviewee_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_interview_schedule_interviewer ON interview_schedule(Interviewer_ID, date, time)")
+            # Older databases lack the email columns and the unique slot index; add them in place.
+            # Duplicate bookings are never deleted here, see schedule_migration.py
+            ensure_schedule_columns(conn)
             conn.commit()
         print("✅ Database initialized with indexes.")
     except sqlite3.Error as e:
         print(f"❌ Error initializing database: {e}")
 
-init_db()
+def serving_process():
+    """False in spawned pool workers, which re-import this module, and in the debug reloader's watcher."""
+    if multiprocessing.parent_process() is not None:
+        return False
+    return __name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN") == "true"
+
+warmup = Warmup()
+warmup.add("scheduler", load_scheduler)
+warmup.add("scheduling_worker", load_scheduling_worker)
+warmup.add("resume_parser", load_resume_parser)
+warmup.add("resume_jobs", load_resume_jobs)
+
+if multiprocessing.parent_process() is None:
+    init_db()
+if serving_process():
+    warmup.start()
+
+def score_for(scores_attr, pair):
+    """Score from the warmed-up scheduler, or 0 while it is still loading."""
+    scheduler = warmup.get("scheduler")
+    return getattr(scheduler, scores_attr).get(pair, 0) if scheduler else 0
+
+def warming_up_response():
+    return render_template(
+        'application_result.html',
+        result="error",
+        message="The service is starting up. Please try again in a minute."
+    ), 503
 
 def validate_phone_number(phone_number):
     pattern = r'^\d{10}$'
@@ -90,7 +151,7 @@ def validate_phone_number(phone_number):
 
 def validate_user_id(role, user_id):
     try:
-        with sqlite3.connect(DB_PATH, timeout=10) as conn:
+        with db.connect() as conn:
             cursor = conn.cursor()
             if role == 'candidate':
                 cursor.execute("SELECT 1 FROM Interviewee WHERE interviewee_id = ?", (user_id,))
@@ -102,6 +163,30 @@ def validate_user_id(role, user_id):
         print(f"❌ Error validating user ID: {e}")
         return False
 
+@app.route('/healthz')
+def healthz():
+    return jsonify({"status": "ok"}), 200
+
+@app.route('/readyz')
+def readyz():
+    report = warmup.report()
+    return jsonify(report), 200 if report["ready"] else 503
+
+@app.route('/scheduling_metrics')
+def scheduling_metrics():
+    scheduling_worker = warmup.get("scheduling_worker")
+    if scheduling_worker is None:
+        return jsonify({"message": "Scheduling worker is still warming up"}), 503
+    from dataload import DataLoader
+    ResumeParserService = warmup.get("resume_parser")
+    resume_jobs = warmup.get("resume_jobs")
+    return jsonify({
+        **scheduling_worker.metrics(),
+        "data_snapshot": DataLoader.snapshot_stats(),
+        "resume_extraction": ResumeParserService.extraction_stats.metrics() if ResumeParserService else None,
+        "parse_cache": resume_jobs.parse_cache.metrics() if resume_jobs else None,
+    }), 200
+
 @app.route('/')
 def home():
     return render_template('DRDO1.html')
@@ -175,7 +260,7 @@ def expert_dashboard():
     if not user_id:
         return "Invalid user ID", 400
     try:
-        with sqlite3.connect(DB_PATH, timeout=10) as conn:
+        with db.connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT s.Interviewer_ID, s.Interviewee_ID, s.date, s.time, 
@@ -197,8 +282,8 @@ def expert_dashboard():
                 "interviewer_email": row[4],
                 "interviewee_email": row[5],
                 "interviewee_name": row[6],
-                "cosine_score": scheduler.similarity_scores.get((row[1], user_id), 0),
-                "matching_score": scheduler.matching_scores.get((row[1], user_id), 0)
+                "cosine_score": score_for("similarity_scores", (row[1], user_id)),
+                "matching_score": score_for("matching_scores", (row[1], user_id))
             }
             for row in schedule
         ]
@@ -214,7 +299,7 @@ def candidate_dashboard():
     if not user_id:
         return "Invalid user ID", 400
     try:
-        with sqlite3.connect(DB_PATH, timeout=10) as conn:
+        with db.connect() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT s.Interviewer_ID, s.Interviewee_ID, s.date, s.time, 
@@ -233,8 +318,8 @@ def candidate_dashboard():
                 "time": row[3],
                 "interviewer_name": row[4],
                 "interviewer_email": row[5],
-                "cosine_score": scheduler.similarity_scores.get((user_id, row[0]), 0),
-                "matching_score": scheduler.matching_scores.get((user_id, row[0]), 0)
+                "cosine_score": score_for("similarity_scores", (user_id, row[0])),
+                "matching_score": score_for("matching_scores", (user_id, row[0]))
             }
             for row in schedule
         ]
@@ -245,15 +330,6 @@ def candidate_dashboard():
         print(f"❌ Error loading candidate dashboard: {e}")
         return "Database error", 500
 
-def async_schedule_candidate(user_id):
-    """Run scheduling in a background thread."""
-    try:
-        scheduler.schedule_single_candidate(user_id)
-        scheduler.store_schedule_in_db()
-        print(f"✅ Background scheduling completed for {user_id}")
-    except Exception as e:
-        print(f"❌ Background scheduling failed for {user_id}: {e}")
-
 @app.route('/candidate_signup', methods=['GET', 'POST'])
 def candidate_signup():
     if request.method == 'POST':
@@ -266,46 +342,12 @@ def candidate_signup():
         if not validate_phone_number(phone_number):
             return "Invalid phone number", 400
 
-        user_id = generate_candidate_id()
-        filename = secure_filename(resume.filename)
-        timestamp = int(time.time())
-        file_path = os.path.join(UPLOAD_FOLDER, f"{user_id}_{timestamp}_{filename}")
-        resume.save(file_path)
+        resume_jobs = warmup.get("resume_jobs", SIGNUP_WARMUP_TIMEOUT)
+        if resume_jobs is None:
+            return warming_up_response()
 
         try:
-            print(f"✅ Parsing resume at path: {file_path}")
-            parsed_data = ResumeParserService.parse_resume(file_path)
-
-            name = parsed_data.get("name", "Candidate")
-            email = parsed_data.get("email", "unknown@example.com")
-            age = parsed_data.get("age", 25)
-            experience = parsed_data.get("experience", 0)
-            gate_score = parsed_data.get("gate_score", 0)
-            core_field = parsed_data.get("core_field", "General")
-
-            print(f"✅ Extracted data: Name={name}, Email={email}, Gate={gate_score}, Core Field={core_field}")
-
-            if gate_score < 1150:
-                return render_template(
-                    'application_result.html',
-                    result="not_eligible",
-                    message="Your GATE score does not meet the minimum requirement of 1150 for DRDO.",
-                    gate_score=gate_score
-                )
-
-            store_candidate_data(user_id, name, email, phone_number, age, experience, gate_score, core_field)
-
-            # Update scores incrementally and schedule asynchronously
-            scheduler.update_scores_for_candidate(user_id, core_field)
-            Thread(target=async_schedule_candidate, args=(user_id,)).start()
-
-            return render_template(
-                'application_result.html',
-                result="success",
-                message=f"Your application has been submitted! Your candidate ID is {user_id}. Your interview is being scheduled and will be available on your dashboard soon.",
-                candidate_id=user_id
-            )
-
+            job_id, user_id = resume_jobs.reserve()
         except sqlite3.Error as e:
             print(f"❌ SQLite error during signup: {e}")
             return render_template(
@@ -313,21 +355,56 @@ def candidate_signup():
                 result="error",
                 message="Database error: Unable to store your data. Please try again later."
             )
+
+        filename = secure_filename(resume.filename)
+        timestamp = int(time.time())
+        try:
+            # Parsing, the GATE check, storing and scheduling all continue in the background
+            resume_jobs.start(job_id, user_id, phone_number, resume.stream, f"{user_id}_{timestamp}_{filename}")
         except Exception as e:
-            print(f"❌ Error processing resume: {e}")
+            print(f"❌ Error queueing resume: {e}")
+            resume_jobs.fail(job_id, "There was an error processing your resume. Please try again.")
             return render_template(
                 'application_result.html',
                 result="error",
                 message="There was an error processing your resume. Please try again."
             )
 
+        return render_template(
+            'application_result.html',
+            result="success",
+            message=f"Your application has been received! Your candidate ID is {user_id}. Your resume is being processed; track it with job ID {job_id}.",
+            candidate_id=user_id,
+            job_id=job_id
+        )
+
     return render_template('candidate_signup.html')
 
+@app.route('/signup_status/<job_id>')
+def signup_status(job_id):
+    from resume_jobs import ResumeJobService
+    try:
+        job = ResumeJobService.status(job_id)
+    except sqlite3.Error as e:
+        print(f"❌ Error reading signup status: {e}")
+        return jsonify({"message": "Database error"}), 500
+    if job is None:
+        return jsonify({"message": "Unknown job ID"}), 404
+    return jsonify(job), 200
+
 @app.route('/compute_schedule', methods=['POST'])
 def compute_schedule():
+    scheduler = warmup.get("scheduler")
+    scheduling_worker = warmup.get("scheduling_worker")
+    if scheduler is None or scheduling_worker is None:
+        return jsonify({"message": "Scheduler is still warming up", "warmup": warmup.report()}), 503
+    mode = request.args.get('mode', 'greedy')
+    if mode not in ('greedy', 'batch'):
+        return jsonify({"message": "mode must be 'greedy' or 'batch'"}), 400
     try:
-        scheduler.generate_schedule()
-        scheduler.store_schedule_in_db()
+        with scheduling_worker.lock:
+            scheduler.generate_schedule(mode, SCHEDULE_WORKERS)
+            scheduler.store_schedule_in_db()
         print(f"✅ Schedule computed and stored: {len(scheduler.schedule)} interviews")
         return jsonify({"message": "Schedule computed successfully"}), 200
     except Exception as e:
@@ -336,6 +413,9 @@ def compute_schedule():
 
 @app.route('/generate_resume', methods=['GET'])
 def generate_resume():
+    ResumeParserService = warmup.get("resume_parser", SIGNUP_WARMUP_TIMEOUT)
+    if ResumeParserService is None:
+        return jsonify({"message": "Resume service is still warming up"}), 503
     try:
         filename = "prakash.pdf"
         file_path = os.path.join(UPLOAD_FOLDER, filename)
@@ -346,5 +426,4 @@ def generate_resume():
         return jsonify({"message": "Error generating resume"}), 500
 
 if __name__ == '__main__':
-    init_db()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,293 @@
+import argparse
+import os
+import sqlite3
+import sys
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import db
+from change_log import install_change_triggers
+from password import insert_candidates
+from resume_jobs import DEFAULT_PARSE_WORKERS, MIN_GATE_SCORE, init_parse_worker, parse_resume_file
+from resume_parser import ResumeParserService
+from upload_store import UPLOAD_FOLDER, ParseCache, UploadStore
+
+DEFAULT_BATCH_SIZE = 100
+# Files whose outcome is recorded; anything else is (re)ingested on the next run
+DONE_STATUSES = ("stored", "rejected", "duplicate", "failed")
+# Errors listed individually in the summary
+SUMMARY_ERRORS = 20
+
+
+def iter_pdfs(source):
+    """Yields (member name, binary stream) for each PDF in a directory, zip or tar archive.
+
+    Members come in a stable order, so a resumed run meets them in the same sequence.
+    Each stream is only valid until the next member is taken.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    with open(path, "rb") as stream:
+                        yield os.path.relpath(path, source), stream
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                    with archive.open(info) as stream:
+                        yield info.filename, stream
+    elif tarfile.is_tarfile(source):
+        # Stream mode reads the archive front to back once, compressed or not
+        with tarfile.open(source, "r|*") as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(".pdf"):
+                    yield member.name, archive.extractfile(member)
+    else:
+        raise ValueError(f"{source} is not a directory, zip or tar archive")
+
+
+class BulkIngestor:
+    """Ingests a directory or archive of resume PDFs as new candidates.
+
+    Files are read and hashed into the upload store one at a time, parsed on a pool of
+    `workers` processes (at most two files per worker in flight), checked against the GATE
+    minimum and written `batch_size` at a time. Each batch's candidates and the outcome of
+    every file in it are committed in one transaction, so after a crash the next run skips
+    exactly the files already recorded in `ingest_progress`. The same transaction fires the
+    change_log triggers, so a running app scores each batch in one refresh.
+    """
+
+    def __init__(self, source, workers=DEFAULT_PARSE_WORKERS, batch_size=DEFAULT_BATCH_SIZE,
+                 upload_folder=UPLOAD_FOLDER, retry_failed=False):
+        self.source = os.path.abspath(source)
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.retry_failed = retry_failed
+        self.uploads = UploadStore(upload_folder)
+        self.parse_cache = ParseCache()
+        # Outcome rows and candidates of the batch being built
+        self.outcomes = []
+        self.candidates = []
+        self.counts = dict.fromkeys(("seen", "skipped") + DONE_STATUSES, 0)
+        self.bytes_read = 0
+        self.errors = []
+        self.batches = 0
+
+    def _ensure_schema(self):
+        with db.connect() as conn:
+            install_change_triggers(conn)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_progress (
+                    source TEXT NOT NULL,
+                    member TEXT NOT NULL,
+                    content_hash TEXT,
+                    status TEXT NOT NULL,
+                    candidate_id TEXT,
+                    gate_score INTEGER,
+                    message TEXT,
+                    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (source, member)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ingest_progress_hash ON ingest_progress(content_hash)")
+            # Same index app.init_db creates; without it every candidate written scans Interviewee
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_interviewee_id ON Interviewee(interviewee_id)")
+            statuses = [status for status in DONE_STATUSES if not (self.retry_failed and status == "failed")]
+            done = {member for (member,) in conn.execute(
+                f"SELECT member FROM ingest_progress WHERE source = ? AND status IN ({','.join('?' * len(statuses))})",
+                [self.source] + statuses
+            )}
+            # A resume already ingested from any source is not made into a second candidate
+            stored = dict(conn.execute(
+                "SELECT content_hash, candidate_id FROM ingest_progress WHERE status = 'stored'"
+            ).fetchall())
+        return done, stored
+
+    def run(self):
+        """Ingests every PDF of the source not already done; returns the summary dict."""
+        started = time.perf_counter()
+        done, self.stored_hashes = self._ensure_schema()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_parse_worker) as pool:
+            pending = deque()
+            for member, stream in iter_pdfs(self.source):
+                self.counts["seen"] += 1
+                if member in done:
+                    self.counts["skipped"] += 1
+                    continue
+                pending.append(self._submit(pool, member, stream))
+                if len(pending) >= 2 * self.workers:
+                    self._collect(*pending.popleft())
+            while pending:
+                self._collect(*pending.popleft())
+        self._flush()
+        return self._summary(time.perf_counter() - started)
+
+    def _submit(self, pool, member, stream):
+        """Stores one file and returns (member, content_hash, future of its parse result)."""
+        try:
+            content_hash, file_path = self.uploads.save(stream, f"bulk:{self.source}:{member}")
+            self.bytes_read += os.path.getsize(file_path)
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+            return member, None, future
+        cached = self.parse_cache.get(content_hash, MIN_GATE_SCORE)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return member, content_hash, future
+        return member, content_hash, pool.submit(parse_resume_file, file_path)
+
+    def _collect(self, member, content_hash, future):
+        try:
+            parsed_data = future.result()
+        except Exception as e:
+            self._record(member, content_hash, "failed", message=str(e))
+            return
+        if not parsed_data:
+            self._record(member, content_hash, "failed", message="No fields could be extracted")
+            return
+        self.parse_cache.put(content_hash, parsed_data)
+        ResumeParserService.extraction_stats.record(parsed_data.pop("extraction", None))
+
+        gate_score = parsed_data.get("gate_score", 0)
+        if gate_score < MIN_GATE_SCORE:
+            self._record(member, content_hash, "rejected", gate_score=gate_score,
+                         message=f"GATE score below {MIN_GATE_SCORE}")
+        elif content_hash in self.stored_hashes:
+            self._record(member, content_hash, "duplicate", candidate_id=self.stored_hashes[content_hash],
+                         gate_score=gate_score, message="Same resume already ingested")
+        else:
+            # The candidate id is assigned when the batch is written
+            self.stored_hashes[content_hash] = None
+            self.candidates.append((len(self.outcomes), content_hash, parsed_data))
+            self._record(member, content_hash, "stored", gate_score=gate_score)
+
+    def _record(self, member, content_hash, status, candidate_id=None, gate_score=None, message=None):
+        self.outcomes.append([self.source, member, content_hash, status, candidate_id, gate_score, message])
+        if status == "failed":
+            self.errors.append((member, message))
+        if len(self.outcomes) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        """Writes the batch's candidates and outcomes in one transaction.
+
+        If that transaction fails, the batch's new candidates (and duplicates of them) are
+        recorded as failed instead, so the run goes on and a later --retry-failed run
+        picks them up again.
+        """
+        if not self.outcomes:
+            return
+        self.batches += 1
+        try:
+            stored = self._write_batch()
+            print(f"✅ Ingested batch {self.batches}: {len(self.outcomes)} files, {stored} new candidates")
+        except sqlite3.Error as e:
+            print(f"❌ Writing batch {self.batches} failed, its new candidates are recorded as failed: {e}")
+            self._fail_batch(f"Batch write failed: {e}")
+        for outcome in self.outcomes:
+            self.counts[outcome[3]] += 1
+        self.outcomes, self.candidates = [], []
+
+    def _write_batch(self):
+        """Assigns the batch's candidate ids and commits candidates and outcomes; returns the candidates written."""
+        with db.connect() as conn:
+            # IMMEDIATE takes the write lock before the ids are chosen, as signup reservations do
+            conn.execute("BEGIN IMMEDIATE")
+            number = self._highest_candidate_number(conn)
+            rows = []
+            for position, content_hash, parsed_data in self.candidates:
+                number += 1
+                candidate_id = f"CAND{number:04d}"
+                self.outcomes[position][4] = candidate_id
+                self.stored_hashes[content_hash] = candidate_id
+                rows.append((candidate_id, parsed_data.get("name", "Unknown"),
+                             parsed_data.get("email", "unknown@example.com"),
+                             parsed_data.get("phone", "Unknown"), parsed_data.get("core_field", "General")))
+            for outcome in self.outcomes:
+                if outcome[3] == "duplicate" and outcome[4] is None:
+                    outcome[4] = self.stored_hashes[outcome[2]]  # Of a candidate stored earlier in this batch
+            insert_candidates(conn, rows)
+            self._write_outcomes(conn)
+        return len(rows)
+
+    def _write_outcomes(self, conn):
+        conn.executemany("""
+            INSERT OR REPLACE INTO ingest_progress
+            (source, member, content_hash, status, candidate_id, gate_score, message)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, self.outcomes)
+
+    def _fail_batch(self, message):
+        """Turns the rolled-back batch's new candidates into failed outcomes and records the batch on its own."""
+        batch_hashes = {content_hash for _, content_hash, _ in self.candidates}
+        for content_hash in batch_hashes:
+            self.stored_hashes.pop(content_hash, None)
+        for outcome in self.outcomes:
+            if outcome[3] == "stored" or (outcome[3] == "duplicate" and outcome[2] in batch_hashes):
+                outcome[3], outcome[4], outcome[6] = "failed", None, message
+                self.errors.append((outcome[1], message))
+        try:
+            with db.connect() as conn:
+                self._write_outcomes(conn)
+        except sqlite3.Error as e:
+            # Nothing of this batch is recorded, so the next run processes it again
+            print(f"❌ Recording the outcomes of batch {self.batches} failed too: {e}")
+
+    @staticmethod
+    def _highest_candidate_number(conn):
+        """The largest CANDnnnn number in use, by a candidate or by a pending signup job."""
+        queries = ["SELECT MAX(CAST(substr(interviewee_id, 5) AS INTEGER)) FROM Interviewee WHERE interviewee_id LIKE 'CAND%'"]
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'signup_jobs'").fetchone():
+            queries.append("SELECT MAX(CAST(substr(candidate_id, 5) AS INTEGER)) FROM signup_jobs WHERE candidate_id LIKE 'CAND%'")
+        return max(conn.execute(query).fetchone()[0] or 0 for query in queries)
+
+    def _summary(self, seconds):
+        processed = self.counts["seen"] - self.counts["skipped"]
+        summary = {
+            **self.counts,
+            "batches": self.batches,
+            "seconds": round(seconds, 3),
+            "files_per_second": round(processed / seconds, 2) if seconds else None,
+            "mb_per_second": round(self.bytes_read / 1e6 / seconds, 3) if seconds else None,
+            "parse_cache": self.parse_cache.metrics(),
+            "extraction": ResumeParserService.extraction_stats.metrics(),
+            "errors": self.errors[:SUMMARY_ERRORS],
+        }
+        print(f"✅ Ingested {processed} of {self.counts['seen']} files in {seconds:.1f}s "
+              f"({summary['files_per_second']} files/s, {summary['mb_per_second']} MB/s): "
+              f"{self.counts['stored']} stored, {self.counts['rejected']} rejected, "
+              f"{self.counts['duplicate']} duplicates, {self.counts['failed']} failed, "
+              f"{self.counts['skipped']} already done")
+        for member, message in self.errors[:SUMMARY_ERRORS]:
+            print(f"❌ {member}: {message}")
+        if len(self.errors) > SUMMARY_ERRORS:
+            print(f"⚠️ {len(self.errors) - SUMMARY_ERRORS} more errors not shown")
+        return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest a directory, zip or tar archive of resume PDFs.")
+    parser.add_argument("source", help="directory, .zip or .tar[.gz] of PDFs")
+    parser.add_argument("--db", help="SQLite database (default: DRDO_DB_PATH)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_PARSE_WORKERS, help="parse processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="files per transaction")
+    parser.add_argument("--upload-folder", default=UPLOAD_FOLDER)
+    parser.add_argument("--retry-failed", action="store_true", help="parse files that failed in an earlier run again")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.source):
+        parser.error(f"{args.source} does not exist")
+    if args.db:
+        db.configure(args.db)
+    summary = BulkIngestor(args.source, args.workers, args.batch_size, args.upload_folder, args.retry_failed).run()
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
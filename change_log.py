@@ -0,0 +1,102 @@
+import db
+
+# Source table -> (column holding the affected user's id, which side of the score matrices it is)
+TRACKED_TABLES = {
+    "Interviewer": ("interviewer_id", "interviewer"),
+    "Interviewer_Expertise": ("interviewer_id", "interviewer"),
+    "Interviewee": ("interviewee_id", "interviewee"),
+    "Interviewee_Interests": ("interviewee_id", "interviewee"),
+}
+# Log rows older than this are pruned; every app worker reads the log, so nobody deletes on read
+CHANGE_LOG_RETENTION = "-7 days"
+
+
+def install_change_triggers(conn):
+    """Creates the change_log table and the triggers that append one row per changed source row."""
+    # user_id has no declared type, so it keeps the source id's type: INTEGER ids stay integers
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            user_id,
+            op TEXT NOT NULL,
+            changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    for table, (id_column, kind) in TRACKED_TABLES.items():
+        log = f"INSERT INTO change_log (table_name, kind, user_id, op) VALUES ('{table}', '{kind}', {{row}}.{id_column}, '{{op}}')"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON {table}
+            BEGIN {log.format(row="NEW", op="INSERT")}; END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON {table}
+            BEGIN {log.format(row="OLD", op="DELETE")}; END
+        """)
+        # An update that moves a row to another user changes both users
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_update AFTER UPDATE ON {table}
+            BEGIN
+                {log.format(row="NEW", op="UPDATE")};
+                INSERT INTO change_log (table_name, kind, user_id, op)
+                SELECT '{table}', '{kind}', OLD.{id_column}, 'UPDATE' WHERE OLD.{id_column} IS NOT NEW.{id_column};
+            END
+        """)
+
+
+class ChangeLogConsumer:
+    """Applies source-table changes recorded in change_log to a running InterviewScheduler.
+
+    Each poll reads the log past the last applied id and hands the scheduler the distinct
+    interviewers and interviewees that changed, so it recomputes only those score columns
+    and rows. The position starts at the end of the log when the consumer is created,
+    since the scheduler's scores already reflect everything before it.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        with db.connect() as conn:
+            install_change_triggers(conn)
+            self.position = conn.execute("SELECT COALESCE(MAX(id), 0) FROM change_log").fetchone()[0]
+        self.polls = 0
+        self.applied = 0
+        self.interviewers_refreshed = 0
+        self.interviewees_refreshed = 0
+
+    def poll(self):
+        """Applies any new changes; returns the number of log rows consumed."""
+        with db.connect() as conn:
+            rows = conn.execute(
+                "SELECT id, kind, user_id FROM change_log WHERE id > ? ORDER BY id", (self.position,)
+            ).fetchall()
+            if rows:
+                conn.execute("DELETE FROM change_log WHERE changed_at < datetime('now', ?)", (CHANGE_LOG_RETENTION,))
+        self.polls += 1
+        if not rows:
+            return 0
+
+        interviewer_ids = dict.fromkeys(user_id for _, kind, user_id in rows if kind == "interviewer" and user_id)
+        interviewee_ids = dict.fromkeys(user_id for _, kind, user_id in rows if kind == "interviewee" and user_id)
+        # Interviewers first: a new TF-IDF vocabulary or skill matrix also applies to the interviewee rows
+        if interviewer_ids:
+            self.scheduler.refresh_interviewers(list(interviewer_ids))
+        if interviewee_ids:
+            self.scheduler.refresh_interviewees(list(interviewee_ids))
+
+        self.position = rows[-1][0]
+        self.applied += len(rows)
+        self.interviewers_refreshed += len(interviewer_ids)
+        self.interviewees_refreshed += len(interviewee_ids)
+        print(f"✅ Applied {len(rows)} change_log entries: {len(interviewer_ids)} interviewers, "
+              f"{len(interviewee_ids)} interviewees")
+        return len(rows)
+
+    def metrics(self):
+        return {
+            "position": self.position,
+            "polls": self.polls,
+            "applied": self.applied,
+            "interviewers_refreshed": self.interviewers_refreshed,
+            "interviewees_refreshed": self.interviewees_refreshed,
+        }
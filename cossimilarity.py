@@ -1,43 +1,91 @@
+import numpy as np
 from dataload import DataLoader
+from score_store import best_pairs
+from skill_index import SignatureCache, code_values, incidence_matrix
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 class SimilarityCalculator:
     """Computes cosine similarity between interviewers and interviewees using live data."""
 
+    signature_stats = SignatureCache()
+
+    @staticmethod
+    def fit_interviewers(interviewers_df):
+        """Fits the TF-IDF vocabulary on interviewer fields; returns (vectorizer, interviewer_tfidf)."""
+        interviewer_fields = interviewers_df["field_of_expertise"].fillna('').astype(str).tolist()
+        vectorizer = TfidfVectorizer()
+        return vectorizer, vectorizer.fit_transform(interviewer_fields)
+
+    @staticmethod
+    def score_interviewees(vectorizer, interviewer_tfidf, interviewees):
+        """Scores each distinct normalized field among `interviewees` once against every interviewer.
+
+        Returns (distinct_scores, inverse, interviewee_ids), where row inverse[i] of
+        distinct_scores holds the scores of the i-th interviewee with a non-empty field.
+        """
+        interviewee_ids, interviewee_fields = [], []
+        for interviewee in interviewees:
+            interviewee_field = str(interviewee["core_field"] or "").strip()
+            if not interviewee_field:
+                continue
+            interviewee_ids.append(interviewee["user_id"])
+            # TfidfVectorizer lowercases before tokenizing, so case variants share one row
+            interviewee_fields.append(interviewee_field.lower())
+
+        inverse, distinct_fields = code_values(interviewee_fields)
+        if not distinct_fields:
+            return np.zeros((0, interviewer_tfidf.shape[0])), inverse, interviewee_ids
+
+        distinct_tfidf = vectorizer.transform(list(distinct_fields))
+        distinct_scores = cosine_similarity(distinct_tfidf, interviewer_tfidf, dense_output=False).toarray()
+        return distinct_scores, inverse, interviewee_ids
+
+    @staticmethod
+    def _distinct_similarity():
+        """Returns (distinct_scores, inverse, interviewee_ids, interviewer_ids) for every interviewee."""
+        interviewers_df = DataLoader.load_interviewers()
+        if interviewers_df.empty:
+            print("❌ No interviewer data available.")
+            return np.zeros((0, 0)), np.zeros(0, dtype=np.int64), [], []
+
+        vectorizer, interviewer_tfidf = SimilarityCalculator.fit_interviewers(interviewers_df)
+        distinct_scores, inverse, interviewee_ids = SimilarityCalculator.score_interviewees(
+            vectorizer, interviewer_tfidf, DataLoader.get_interviewees()
+        )
+        SimilarityCalculator.signature_stats.record_batch(len(inverse), len(distinct_scores))
+        return distinct_scores, inverse, interviewee_ids, interviewers_df["interviewer_id"].tolist()
+
     @staticmethod
-    def compute_similarity():
+    def compute_similarity_matrix():
+        """Scores every interviewee against every interviewer.
+
+        Returns (scores, interviewee_ids, interviewer_ids), where scores[i, j] is the
+        cosine similarity between interviewee row i and interviewer row j.
+        """
+        distinct_scores, inverse, interviewee_ids, interviewer_ids = SimilarityCalculator._distinct_similarity()
+        return distinct_scores[inverse], interviewee_ids, interviewer_ids
+
+    @staticmethod
+    def compute_similarity(shard_size=None, workers=1, progress=None):
+        """Best-scoring interviewer per interviewee as {(interviewee_id, interviewer_id): score}.
+
+        With a `shard_size`, interviewees are scored in id-range shards on `workers`
+        processes so memory stays bounded by the shard size (see sharded_scoring).
+        """
         try:
-            interviewers_df = DataLoader.load_interviewers()
-            if interviewers_df.empty:
-                print("❌ No interviewer data available.")
-                return {}
-
-            interviewer_fields = interviewers_df["field_of_expertise"].fillna('').astype(str).tolist()
-            vectorizer = TfidfVectorizer()
-            interviewer_tfidf = vectorizer.fit_transform(interviewer_fields)
-
-            similarity_map = {}
-            for interviewee in DataLoader.get_interviewees():
-                interviewee_id = interviewee["user_id"]
-                interviewee_field = str(interviewee["core_field"] or "").strip()
-                if not interviewee_field:
-                    continue
-
-                interviewee_tfidf = vectorizer.transform([interviewee_field])
-                relevance_scores = cosine_similarity(interviewee_tfidf, interviewer_tfidf)[0]
-
-                max_score = 0
-                best_interviewer = None
-                for j, interviewer in interviewers_df.iterrows():
-                    score = relevance_scores[j]
-                    if score > max_score:
-                        max_score = score
-                        best_interviewer = interviewer["interviewer_id"]
-                if best_interviewer:
-                    similarity_map[(interviewee_id, best_interviewer)] = max_score
-
-            print(f"✅ Computed similarity scores for {len(similarity_map)} interviewee-interviewer pairs.")
+            if shard_size:
+                from sharded_scoring import ShardedScorer
+                similarity_map = ShardedScorer(shard_size, workers, progress).similarity()
+            else:
+                distinct_scores, inverse, interviewee_ids, interviewer_ids = SimilarityCalculator._distinct_similarity()
+                if not interviewer_ids:
+                    return {}
+                similarity_map = best_pairs(distinct_scores, inverse, interviewee_ids, interviewer_ids)
+
+            hit_ratio = SimilarityCalculator.signature_stats.hit_ratio
+            print(f"✅ Computed similarity scores for {len(similarity_map)} interviewee-interviewer pairs "
+                  f"(signature cache hit ratio {hit_ratio:.1%}).")
             return similarity_map
 
         except Exception as e:
@@ -45,29 +93,122 @@ class SimilarityCalculator:
             return {}
 
     @staticmethod
-    def compute_jaccard_similarity():
+    def tokenize_interviewers(interviewers_df):
+        return [frozenset(str(field or "").lower().split()) for field in interviewers_df["field_of_expertise"]]
+
+    @staticmethod
+    def jaccard_interviewees(interviewer_tokens, interviewees):
+        """Jaccard scores of each distinct interviewee token set against every interviewer.
+
+        Intersections come from one product of binary token-incidence matrices and unions
+        from the token counts. Returns (distinct_sets, distinct_scores, inverse, interviewee_ids)
+        with float32 scores; interviewees without tokens are skipped.
+        """
+        interviewee_ids, signatures = [], []
+        for interviewee in interviewees:
+            e_set = frozenset(str(interviewee["core_field"] or "").lower().split())
+            if not e_set:
+                continue
+            interviewee_ids.append(interviewee["user_id"])
+            signatures.append(e_set)
+
+        inverse, distinct_sets = code_values(signatures)
+        distinct_sets = list(distinct_sets)
+
+        token_codes = {}
+        for tokens in interviewer_tokens:
+            for token in tokens:
+                token_codes.setdefault(token, len(token_codes))
+        interviewee_incidence = incidence_matrix(distinct_sets, token_codes)
+        interviewer_incidence = incidence_matrix(interviewer_tokens, token_codes)
+
+        intersection = (interviewee_incidence @ interviewer_incidence.T).toarray()
+        interviewee_sizes = np.array([len(tokens) for tokens in distinct_sets], dtype=np.int64)
+        interviewer_sizes = np.array([len(tokens) for tokens in interviewer_tokens], dtype=np.int64)
+        # Every interviewee set is non-empty, so the union is never zero
+        union = interviewee_sizes[:, None] + interviewer_sizes[None, :] - intersection
+        distinct_scores = (intersection / np.maximum(union, 1)).astype(np.float32)
+        return distinct_sets, distinct_scores, inverse, interviewee_ids
+
+    @staticmethod
+    def compute_jaccard_similarity(shard_size=None, workers=1, progress=None):
+        """Jaccard similarity of lowercased field tokens for every interviewee-interviewer pair.
+
+        Returns a JaccardScores, which supports the dict-style lookups the regression
+        code uses. With a `shard_size`, interviewees are scored in shards as in
+        compute_similarity.
+        """
         try:
+            if shard_size:
+                from sharded_scoring import ShardedScorer
+                return ShardedScorer(shard_size, workers, progress).jaccard()
+
             interviewers_df = DataLoader.load_interviewers()
             if interviewers_df.empty:
                 print("❌ No interviewer data for Jaccard calculation.")
-                return {}
-
-            jaccard_scores = {}
-            for interviewee in DataLoader.get_interviewees():
-                interviewee_id = interviewee["user_id"]
-                e_set = set(str(interviewee["core_field"] or "").lower().split())
-                if not e_set:
-                    continue
-
-                for _, interviewer in interviewers_df.iterrows():
-                    i_set = set(str(interviewer["field_of_expertise"] or "").lower().split())
-                    intersection = len(e_set & i_set)
-                    union = len(e_set | i_set)
-                    score = intersection / union if union != 0 else 0
-                    jaccard_scores[(interviewee_id, interviewer["interviewer_id"])] = score
+                return JaccardScores.empty()
 
-            return jaccard_scores
+            _, distinct_scores, inverse, interviewee_ids = SimilarityCalculator.jaccard_interviewees(
+                SimilarityCalculator.tokenize_interviewers(interviewers_df), DataLoader.get_interviewees()
+            )
+            SimilarityCalculator.signature_stats.record_batch(len(inverse), len(distinct_scores))
+            return JaccardScores.from_rows(distinct_scores, inverse, interviewee_ids,
+                                           interviewers_df["interviewer_id"].tolist())
 
         except Exception as e:
             print(f"❌ Error computing Jaccard similarity: {e}")
-            return {}
\ No newline at end of file
+            return JaccardScores.empty()
+
+
+class JaccardScores:
+    """Compact all-pairs Jaccard result: float32 score rows plus id → index maps.
+
+    Interviewees with the same token set share one row of `distinct_scores`;
+    `interviewee_rows` maps each interviewee id to its row and `interviewer_index`
+    maps each interviewer id to its column.
+    """
+
+    def __init__(self, distinct_scores, interviewee_rows, interviewer_index):
+        self.distinct_scores = distinct_scores
+        self.interviewee_rows = interviewee_rows
+        self.interviewer_index = interviewer_index
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 0), dtype=np.float32), {}, {})
+
+    @classmethod
+    def from_rows(cls, distinct_scores, inverse, interviewee_ids, interviewer_ids):
+        # Later rows win on repeated ids, as they did when pairs were written into a dict
+        interviewee_rows = {interviewee_id: int(row) for interviewee_id, row in zip(interviewee_ids, inverse)}
+        interviewer_index = {interviewer_id: j for j, interviewer_id in enumerate(interviewer_ids)}
+        return cls(distinct_scores, interviewee_rows, interviewer_index)
+
+    @property
+    def matrix(self):
+        """Dense (interviewees × interviewers) matrix in interviewee_rows/interviewer_index order."""
+        rows = np.fromiter(self.interviewee_rows.values(), dtype=np.int64, count=len(self.interviewee_rows))
+        columns = np.fromiter(self.interviewer_index.values(), dtype=np.int64, count=len(self.interviewer_index))
+        return self.distinct_scores[np.ix_(rows, columns)]
+
+    def get(self, pair, default=0):
+        interviewee_id, interviewer_id = pair
+        row = self.interviewee_rows.get(interviewee_id)
+        column = self.interviewer_index.get(interviewer_id)
+        if row is None or column is None:
+            return default
+        return float(self.distinct_scores[row, column])
+
+    def __contains__(self, pair):
+        interviewee_id, interviewer_id = pair
+        return interviewee_id in self.interviewee_rows and interviewer_id in self.interviewer_index
+
+    def __len__(self):
+        return len(self.interviewee_rows) * len(self.interviewer_index)
+
+    def keys(self):
+        return ((interviewee_id, interviewer_id)
+                for interviewee_id in self.interviewee_rows for interviewer_id in self.interviewer_index)
+
+    def items(self):
+        return ((pair, self.get(pair)) for pair in self.keys())
@@ -1,40 +1,113 @@
+import hashlib
 import sqlite3
+import threading
+import db
 
 class DataLoader:
-    """Handles loading data from SQLite database in real-time."""
-    DB_PATH = r"C:\Users\Sudhindra Prakash\Desktop\java project\.venv\Backend\DRDO_Normalized_Updated_Names.db"
+    """Handles loading data from SQLite database in real-time.
+
+    The full interviewee and interviewer joins are kept as columnar snapshots tagged with
+    the database's data_version, so repeated reads are served from memory and a snapshot
+    is only reloaded after some connection has committed a change.
+    """
+    SOURCE_TABLES = ("Interviewer", "Interviewer_Expertise", "Interviewee", "Interviewee_Interests")
+    INTERVIEWEES_QUERY = """
+        SELECT i.interviewee_id AS user_id, i.name, i.email, i.phone, ii.field_of_interest AS core_field
+        FROM Interviewee i
+        LEFT JOIN Interviewee_Interests ii ON i.interviewee_id = ii.interviewee_id
+        {where}
+        ORDER BY i.interviewee_id, ii.id
+    """
+    INTERVIEWERS_QUERY = """
+        SELECT i.interviewer_id, i.name, i.email, i.phone, ie.expertise_field AS field_of_expertise
+        FROM Interviewer i
+        LEFT JOIN Interviewer_Expertise ie ON i.interviewer_id = ie.interviewer_id
+    """
+    _snapshots = {}
+    _snapshot_lock = threading.Lock()
+    snapshot_hits = 0
+    snapshot_misses = 0
+
+    @staticmethod
+    def _snapshot(name, query):
+        """(column names, column tuples) of `query`, re-read only if the database changed since the last read."""
+        conn = db.connect()  # Opened first: switching a new file to WAL is itself a change
+        version = db.data_version()
+        with DataLoader._snapshot_lock:
+            cached = DataLoader._snapshots.get(name)
+            if cached is not None and cached[0] == version:
+                DataLoader.snapshot_hits += 1
+                return cached[1]
+            DataLoader.snapshot_misses += 1
+        with conn:
+            cursor = conn.execute(query)
+            names = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        columns = list(zip(*rows)) if rows else [() for _ in names]
+        with DataLoader._snapshot_lock:
+            DataLoader._snapshots[name] = (version, (names, columns))
+        return names, columns
 
     @staticmethod
-    def get_interviewees():
-        """Yields interviewee data one-by-one from the database."""
+    def snapshot_stats():
+        lookups = DataLoader.snapshot_hits + DataLoader.snapshot_misses
+        return {
+            "hits": DataLoader.snapshot_hits,
+            "misses": DataLoader.snapshot_misses,
+            "hit_ratio": round(DataLoader.snapshot_hits / lookups, 4) if lookups else None,
+        }
+
+    @staticmethod
+    def get_interviewees(id_range=None):
+        """Yields interviewee data one-by-one from the database.
+
+        Rows come in id order, each interviewee's interests in the order they were added,
+        so "the last row per id" means the same thing on both paths. With
+        `id_range=(first_id, last_id)` only that inclusive id range is read, straight from
+        the database; otherwise rows come from the cached snapshot.
+        """
         try:
-            with sqlite3.connect(DataLoader.DB_PATH) as conn:
-                conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            if id_range is None:
+                names, columns = DataLoader._snapshot("interviewees", DataLoader.INTERVIEWEES_QUERY.format(where=""))
+                for row in zip(*columns):
+                    yield dict(zip(names, row))
+                return
+            with db.connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT i.interviewee_id AS user_id, i.name, i.email, i.phone, ii.field_of_interest AS core_field
-                    FROM Interviewee i
-                    LEFT JOIN Interviewee_Interests ii ON i.interviewee_id = ii.interviewee_id
-                """)
+                cursor.row_factory = sqlite3.Row  # Return rows as dictionaries
+                cursor.execute(DataLoader.INTERVIEWEES_QUERY.format(where="WHERE i.interviewee_id BETWEEN ? AND ?"),
+                               id_range)
                 for row in cursor.fetchall():
                     yield dict(row)
         except Exception as e:
             print(f"❌ Error fetching interviewees: {e}")
             yield from []  # Empty iterator on failure
 
+    @staticmethod
+    def iter_interviewee_id_ranges(shard_size):
+        """Yields (first_id, last_id, count) ranges that cover every interviewee id in order, shard_size ids each."""
+        try:
+            with db.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT interviewee_id FROM Interviewee WHERE interviewee_id IS NOT NULL ORDER BY interviewee_id")
+                while True:
+                    ids = [row[0] for row in cursor.fetchmany(shard_size)]
+                    if not ids:
+                        break
+                    yield ids[0], ids[-1], len(ids)
+        except Exception as e:
+            print(f"❌ Error reading interviewee id ranges: {e}")
+            yield from []
+
     @staticmethod
     def load_interviewers():
-        """Loads interviewer data as a DataFrame (assumed less volatile)."""
+        """Loads interviewer data as a DataFrame (assumed less volatile), built from the cached snapshot."""
+        import pandas as pd
         try:
-            with sqlite3.connect(DataLoader.DB_PATH) as conn:
-                import pandas as pd
-                query = """
-                    SELECT i.interviewer_id, i.name, i.email, i.phone, ie.expertise_field AS field_of_expertise
-                    FROM Interviewer i
-                    LEFT JOIN Interviewer_Expertise ie ON i.interviewer_id = ie.interviewer_id
-                """
-                df = pd.read_sql_query(query, conn)
-            return df
+            names, columns = DataLoader._snapshot("interviewers", DataLoader.INTERVIEWERS_QUERY)
+            if not columns or not columns[0]:
+                return pd.DataFrame(columns=names)
+            return pd.DataFrame({name: list(column) for name, column in zip(names, columns)}, columns=names)
         except Exception as e:
             print(f"❌ Error loading interviewers: {e}")
             return pd.DataFrame()
@@ -43,7 +116,7 @@ class DataLoader:
     def get_skills_for_user(user_id):
         """Fetches skills for a specific user (interviewee or interviewer)."""
         try:
-            with sqlite3.connect(DataLoader.DB_PATH) as conn:
+            with db.connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT field_of_interest AS skill 
@@ -58,4 +131,51 @@ class DataLoader:
                 return skills
         except Exception as e:
             print(f"❌ Error loading skills for {user_id}: {e}")
-            return set()
\ No newline at end of file
+            return set()
+
+    @staticmethod
+    def load_skill_map(id_range=None, user_ids=None):
+        """Loads users' skills in two bulk scans as {user_id: frozenset(skills)}.
+
+        Optionally restricted to an inclusive `id_range=(first_id, last_id)` or to `user_ids`.
+        """
+        try:
+            where, params = "", ()
+            if id_range is not None:
+                where, params = " WHERE {id} BETWEEN ? AND ?", tuple(id_range)
+            elif user_ids is not None:
+                user_ids = list(user_ids)
+                where, params = f" WHERE {{id}} IN ({','.join('?' * len(user_ids))})", tuple(user_ids)
+            with db.connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT interviewee_id, field_of_interest FROM Interviewee_Interests"
+                               + where.format(id="interviewee_id"), params)
+                rows = cursor.fetchall()
+                cursor.execute("SELECT interviewer_id, expertise_field FROM Interviewer_Expertise"
+                               + where.format(id="interviewer_id"), params)
+                rows += cursor.fetchall()
+            skills = {}
+            for user_id, skill in rows:
+                if user_id is not None and skill:
+                    skills.setdefault(user_id, set()).add(skill)
+            return {user_id: frozenset(user_skills) for user_id, user_skills in skills.items()}
+        except Exception as e:
+            print(f"❌ Error loading skill map: {e}")
+            return {}
+
+    @staticmethod
+    def source_fingerprint():
+        """SHA-256 over every row of the tables the scores are computed from, or None on error."""
+        try:
+            digest = hashlib.sha256()
+            with db.connect() as conn:
+                cursor = conn.cursor()
+                for table in DataLoader.SOURCE_TABLES:
+                    digest.update(table.encode())
+                    cursor.execute(f"SELECT * FROM {table} ORDER BY rowid")
+                    for row in cursor:
+                        digest.update(repr(row).encode())
+            return digest.hexdigest()
+        except Exception as e:
+            print(f"❌ Error fingerprinting source tables: {e}")
+            return None
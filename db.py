@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import threading
+
+# The one place the database location is configured; override with DRDO_DB_PATH
+DB_PATH = os.getenv(
+    "DRDO_DB_PATH",
+    r"C:\Users\Sudhindra Prakash\Desktop\java project\.venv\Backend\DRDO_Normalized_Updated_Names.db"
+)
+
+BUSY_TIMEOUT = 10
+STATEMENT_CACHE_SIZE = 256
+# WAL lets dashboard reads proceed while the scheduling worker writes; NORMAL is durable under WAL
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_local = threading.local()
+# One read-only connection per database, used only to observe commits made by every other connection
+_version_probes = {}
+_version_lock = threading.Lock()
+
+
+def configure(db_path):
+    """Points every module at another database file, e.g. in a worker process or a script."""
+    global DB_PATH
+    DB_PATH = db_path
+
+
+def connect():
+    """This thread's pooled connection to DB_PATH, opened and tuned on first use.
+
+    Use it as `with connect() as conn:`: the block commits on success and rolls back on
+    error, exactly like a fresh sqlite3 connection, but the connection is kept open
+    (and its prepared-statement cache warm) for the thread's next query. Don't close it.
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None or getattr(_local, "pid", None) != os.getpid():
+        # A forked worker must not reuse its parent's connections
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+    conn = connections.get(DB_PATH)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=BUSY_TIMEOUT, cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        connections[DB_PATH] = conn
+    return conn
+
+
+def close_thread_connections():
+    """Closes the calling thread's pooled connections, e.g. before a worker thread exits."""
+    for conn in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
+
+
+def data_version():
+    """(DB_PATH, counter) that changes whenever any connection or process commits to the database.
+
+    Reads `PRAGMA data_version` on a dedicated connection that never writes, so commits
+    from this process's pooled connections count as well as other processes'.
+    """
+    with _version_lock:
+        probe = _version_probes.get(DB_PATH)
+        if probe is None or probe[0] != os.getpid():
+            probe = _version_probes[DB_PATH] = (
+                os.getpid(), sqlite3.connect(DB_PATH, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            )
+        return DB_PATH, probe[1].execute("PRAGMA data_version").fetchone()[0]
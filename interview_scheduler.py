@@ -1,107 +1,245 @@
 import sqlite3
-from datetime import datetime, timedelta
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import db
+from change_log import ChangeLogConsumer
 from dataload import DataLoader
 from cossimilarity import SimilarityCalculator
 from matching import MatchingService
+from interviewer_registry import InterviewerRegistry
+from score_store import ScoreSnapshot, ScoreStore
+from skill_index import SignatureCache, SkillIndex, code_values
+from slot_calendar import DriveWindow, SlotCalendar
+from schedule_migration import ensure_schedule_columns
+from slot_store import SlotStore
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+# Batch assignment: per-slot-rank tie-breaker that spreads load, and the cost of leaving a candidate unassigned
+LOAD_PENALTY = 1e-6
+INELIGIBLE_COST = 1e6
+# Candidate ids per IN (...) lookup, well under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
 
 class InterviewScheduler:
-    def __init__(self):
+    def __init__(self, window=None):
+        self.window = window or DriveWindow()
+        # Taken before the scores are loaded, so no change made while loading is missed
+        self.change_log = ChangeLogConsumer(self)
         self.interviewers = DataLoader.load_interviewers()
-        self.similarity_scores = SimilarityCalculator.compute_similarity()
-        self.matching_scores = MatchingService.compute_matching_scores()
+        self.registry = InterviewerRegistry(self.interviewers)
+        self.snapshot = ScoreSnapshot()
+        self._load_scores()
         self.schedule = []
         self.vectorizer = TfidfVectorizer()
-        self.interviewer_tfidf = self.vectorizer.fit_transform(
-            self.interviewers["field_of_expertise"].fillna('').astype(str).tolist()
-        )
+        self.slot_store = SlotStore()
+        with db.connect() as conn:
+            ensure_schedule_columns(conn)
+        self.interviewer_tfidf = self._fit_interviewer_tfidf()
         self.available_slots = self._initialize_slots()
+        self.score_cache = SignatureCache()
+        self._prepare_incremental_scoring()
+
+    def _load_scores(self):
+        """Reuse the on-disk score snapshot when the source tables are unchanged, else recompute and save it."""
+        fingerprint = DataLoader.source_fingerprint()
+        stores = self.snapshot.load(fingerprint) if fingerprint else None
+        if stores is not None:
+            self.similarity_scores = stores["similarity"]
+            self.matching_scores = stores["matching"]
+            print("✅ Loaded similarity and matching scores from snapshot.")
+            return
+
+        interviewer_ids = self.registry.unique_ids()
+        self.similarity_scores = ScoreStore.from_pairs(SimilarityCalculator.compute_similarity(), interviewer_ids)
+        self.matching_scores = ScoreStore.from_pairs(MatchingService.compute_matching_scores(), interviewer_ids)
+        if fingerprint:
+            self.snapshot.save(fingerprint, {"similarity": self.similarity_scores, "matching": self.matching_scores})
 
     def _initialize_slots(self):
-        """Pre-allocate available slots for each interviewer."""
-        start_date = datetime(2025, 5, 1)
-        end_date = datetime(2025, 5, 5)
-        daily_start = timedelta(hours=10)
-        daily_end = timedelta(hours=17)
-        lunch_start = timedelta(hours=13)
-        lunch_end = lunch_start + timedelta(minutes=30)
-        slot_duration = timedelta(minutes=30)
-        break_after_3 = timedelta(minutes=2)
-
-        slots = {}
-        with sqlite3.connect(DataLoader.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT Interviewer_ID, date, time FROM interview_schedule")
-            taken_slots = cursor.fetchall()
-
-        taken_by_interviewer = {}
-        for interviewer_id, date, time in taken_slots:
-            if interviewer_id not in taken_by_interviewer:
-                taken_by_interviewer[interviewer_id] = set()
-            start_time = time.split('-')[0]
-            taken_by_interviewer[interviewer_id].add((date, start_time))
-
-        for _, interviewer in self.interviewers.iterrows():
-            interviewer_id = interviewer['interviewer_id']
-            slots[interviewer_id] = []
-            current_date = start_date
-            while current_date <= end_date:
-                current_time = daily_start
-                interviews_done = 0
-                while current_time + slot_duration <= daily_end:
-                    if lunch_start <= current_time < lunch_end:
-                        current_time = lunch_end
-                        continue
-                    if interviews_done > 0 and interviews_done % 3 == 0:
-                        current_time += break_after_3
-                    slot_start = (datetime.combine(datetime.today(), datetime.min.time()) + current_time).strftime('%H:%M')
-                    slot_key = (current_date.strftime('%Y-%m-%d'), slot_start)
-                    if interviewer_id not in taken_by_interviewer or slot_key not in taken_by_interviewer[interviewer_id]:
-                        slots[interviewer_id].append({
-                            "Date": current_date.strftime('%Y-%m-%d'),
-                            "Start_Time": slot_start,
-                            "End_Time": (datetime.combine(datetime.today(), datetime.min.time()) + current_time + slot_duration).strftime('%H:%M')
-                        })
-                    current_time += slot_duration
-                    interviews_done += 1
-                current_date += timedelta(days=1)
-
-        print(f"✅ Initialized {sum(len(slots[i]) for i in slots)} available slots across {len(slots)} interviewers.")
+        """Builds the slot calendar from the shared interview_slots table, so it sees other workers' claims."""
+        template_starts, template_ends = self.window.day_template()
+        interviewer_ids = self.registry.unique_ids()
+        slots = SlotCalendar(interviewer_ids, self.window.days(), template_starts, template_ends)
+        self.slot_store.materialize(interviewer_ids, self.window)
+        self._mark_taken_from_store(slots, interviewer_ids)
+
+        print(f"✅ Initialized {slots.total_free()} available slots across {len(slots.interviewer_index)} interviewers.")
         return slots
 
+    def _mark_taken_from_store(self, slots, interviewer_ids):
+        """Marks the given interviewers' slots that are booked in the shared slot table as taken in `slots`."""
+        taken = self.slot_store.taken_slots(interviewer_ids, self.window.start_date, self.window.end_date)
+        if taken:
+            taken_ids, dates, start_times = zip(*taken)
+            slots.mark_taken_many(taken_ids, dates, start_times)
+
+    def _resync_slots(self, interviewer_ids):
+        """Re-reads the given interviewers' calendar rows from the shared slot table, e.g. after a lost claim."""
+        interviewer_ids = list(interviewer_ids)
+        self.available_slots.reset(interviewer_ids)
+        self._mark_taken_from_store(self.available_slots, interviewer_ids)
+
+    def _fit_interviewer_tfidf(self):
+        return self.vectorizer.fit_transform(self.interviewers["field_of_expertise"].fillna('').astype(str).tolist())
+
+    def _prepare_incremental_scoring(self):
+        """Caches the interviewer-side inputs of update_scores_for_candidate, in registry row order."""
+        self.interviewer_skills = SkillIndex(DataLoader.load_skill_map(user_ids=set(self.registry.ids)))
+        self.interviewer_skill_matrix = self.interviewer_skills.incidence_matrix(self.registry.ids)
+        # Store column of each registry row; duplicate interviewer rows map to the same column
+        self.similarity_columns = self.similarity_scores.column_positions(self.registry.ids)
+        self.matching_columns = self.matching_scores.column_positions(self.registry.ids)
+        # Similarity rows depend on the field text alone, and the set of fields is small
+        self._field_similarity = {}
+
     def update_scores_for_candidate(self, candidate_id, core_field):
         """Incrementally update similarity and matching scores for a new candidate."""
-        candidate_field = str(core_field or "").strip()
-        if not candidate_field:
+        self.update_scores_for_candidates([(candidate_id, core_field)])
+
+    def update_scores_for_candidates(self, candidates):
+        """Incrementally updates the score rows of (candidate_id, core_field) pairs, reading skills per chunk."""
+        candidates = [(candidate_id, str(core_field or "").strip()) for candidate_id, core_field in candidates]
+        candidates = [(candidate_id, field) for candidate_id, field in candidates if field]
+        if not candidates:
             return
+        candidate_ids = [candidate_id for candidate_id, _ in candidates]
+        skill_map = {}
+        for start in range(0, len(candidate_ids), LOOKUP_CHUNK):
+            skill_map.update(DataLoader.load_skill_map(user_ids=candidate_ids[start:start + LOOKUP_CHUNK]))
+
+        for candidate_id, candidate_field in candidates:
+            # Candidates sharing a field/skill signature share score rows, so compute each row once
+            candidate_skills = skill_map.get(candidate_id, frozenset())
+            signature = (candidate_field.lower(), candidate_skills)
+            similarity_row, matching_row = self.score_cache.get_or_compute(
+                signature, lambda: self._score_rows(candidate_field, candidate_skills)
+            )
+            self._write_row(self.similarity_scores, self.similarity_columns, candidate_id, similarity_row)
+            self._write_row(self.matching_scores, self.matching_columns, candidate_id, matching_row)
+
+        print(f"✅ Updated scores for {len(candidates)} candidates (signature cache hit ratio {self.score_cache.hit_ratio:.1%})")
 
-        # Update similarity score
-        candidate_tfidf = self.vectorizer.transform([candidate_field])
-        relevance_scores = cosine_similarity(candidate_tfidf, self.interviewer_tfidf)[0]
-        for idx, interviewer in self.interviewers.iterrows():
-            interviewer_id = interviewer['interviewer_id']
-            score = relevance_scores[idx]
-            if score > 0:
-                self.similarity_scores[(candidate_id, interviewer_id)] = score
-
-        # Update matching score
-        candidate_skills = DataLoader.get_skills_for_user(candidate_id)
-        for _, interviewer in self.interviewers.iterrows():
-            interviewer_id = interviewer['interviewer_id']
-            interviewer_field = str(interviewer['field_of_expertise'] or "").lower()
-            interviewer_skills = DataLoader.get_skills_for_user(interviewer_id)
-            common_skills = len(candidate_skills & interviewer_skills)
-            skill_score = common_skills / max(len(candidate_skills), 1)
-            field_score = 1.0 if candidate_field.lower() == interviewer_field else 0.0
-            combined_score = 0.6 * field_score + 0.4 * skill_score
-            if combined_score > 0:
-                self.matching_scores[(candidate_id, interviewer_id)] = combined_score
-
-        print(f"✅ Updated scores for candidate {candidate_id}")
-
-    def generate_schedule(self):
+    def _score_rows(self, candidate_field, candidate_skills):
+        """Similarity and matching scores of one signature against every registry row."""
+        similarity_row = self._field_similarity.get(candidate_field)
+        if similarity_row is None:
+            # TF-IDF rows are L2-normalized, so the cosine row is a single sparse product
+            candidate_tfidf = self.vectorizer.transform([candidate_field])
+            similarity_row = (self.interviewer_tfidf @ candidate_tfidf.T).toarray().ravel()
+            self._field_similarity[candidate_field] = similarity_row
+
+        candidate_vector = self.interviewer_skills.incidence_from_sets([candidate_skills])
+        common_skills = (self.interviewer_skill_matrix @ candidate_vector.T).toarray().ravel()
+        skill_score = common_skills / max(len(candidate_skills), 1)
+        field_code = self.registry.field_code_index.get(candidate_field.lower(), -1)
+        field_score = (self.registry.field_codes == field_code).astype(np.float64)
+        matching_row = 0.6 * field_score + 0.4 * skill_score
+        return similarity_row, matching_row
+
+    @staticmethod
+    def _write_row(store, columns, candidate_id, row_scores):
+        """Writes the non-zero scores of a registry-ordered row into the candidate's store row."""
+        positive = np.flatnonzero(row_scores > 0)
+        if positive.size:
+            store.update_row(candidate_id, columns[positive], row_scores[positive])
+
+    def refresh_interviewees(self, candidate_ids):
+        """Recomputes the score rows of interviewees whose data changed, as one batch; deleted ones are zeroed."""
+        interviewees = self._lookup_candidates(candidate_ids)
+        for candidate_id in candidate_ids:
+            for store in (self.similarity_scores, self.matching_scores):
+                row = store.row(candidate_id)
+                if row is not None:
+                    row[:] = 0
+        self.update_scores_for_candidates(
+            (candidate_id, interviewees[candidate_id]['core_field'])
+            for candidate_id in candidate_ids if candidate_id in interviewees
+        )
+
+    def refresh_interviewers(self, interviewer_ids):
+        """Reloads the interviewer side and recomputes only the score columns of the given interviewers.
+
+        The slot calendar is rebuilt only if the set of interviewers changed, so bookings are kept."""
+        self.interviewers = DataLoader.load_interviewers()
+        self.registry = InterviewerRegistry(self.interviewers)
+        self.interviewer_tfidf = self._fit_interviewer_tfidf()
+        self.score_cache = SignatureCache()
+        self._prepare_incremental_scoring()
+        if self.registry.unique_ids() != list(self.available_slots.interviewer_index):
+            self.available_slots = self._initialize_slots()
+
+        candidates = {}
+        for interviewee in DataLoader.get_interviewees():
+            candidates.setdefault(interviewee['user_id'], str(interviewee['core_field'] or "").strip())
+        candidate_ids = [candidate_id for candidate_id, field in candidates.items() if candidate_id and field]
+        fields = [candidates[candidate_id] for candidate_id in candidate_ids]
+        skill_map = DataLoader.load_skill_map()
+        candidate_skills = [skill_map.get(candidate_id, frozenset()) for candidate_id in candidate_ids]
+
+        field_inverse, distinct_fields = code_values(fields)
+        distinct_tfidf = self.vectorizer.transform(list(distinct_fields)) if distinct_fields else None
+        lowered_fields = np.array([field.lower() for field in fields], dtype=object)
+        skill_matrix = self.interviewer_skills.incidence_from_sets(candidate_skills)
+        skill_counts = np.maximum(np.array([len(skills) for skills in candidate_skills], dtype=np.float64), 1)
+
+        rows_by_id = {}
+        for row, interviewer_id in enumerate(self.registry.ids):
+            rows_by_id.setdefault(interviewer_id, []).append(row)
+        candidate_array = np.array(candidate_ids, dtype=object)
+        for interviewer_id in interviewer_ids:
+            for store in (self.similarity_scores, self.matching_scores):
+                column = store.column(interviewer_id)
+                if column is not None:
+                    column[:] = 0
+            if distinct_tfidf is None:
+                continue
+            for row in rows_by_id.get(interviewer_id, []):
+                similarity = (distinct_tfidf @ self.interviewer_tfidf[row].T).toarray().ravel()[field_inverse]
+                common_skills = (skill_matrix @ self.interviewer_skill_matrix[row].T).toarray().ravel()
+                field_score = (lowered_fields == self.registry.fields[row]).astype(np.float64)
+                matching = 0.6 * field_score + 0.4 * common_skills / skill_counts
+                for store, scores in ((self.similarity_scores, similarity), (self.matching_scores, matching)):
+                    positive = np.flatnonzero(scores > 0)
+                    if positive.size:
+                        store.update_column(interviewer_id, candidate_array[positive], scores[positive])
+        print(f"✅ Recomputed score columns for {len(interviewer_ids)} interviewers against {len(candidate_ids)} interviewees.")
+
+    def _lookup_candidates(self, candidate_ids):
+        """{candidate_id: row with user_id, email, core_field} for the candidates that exist, one query per chunk."""
+        candidate_ids = list(candidate_ids)
+        interviewees = {}
+        with db.connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            for start in range(0, len(candidate_ids), LOOKUP_CHUNK):
+                chunk = candidate_ids[start:start + LOOKUP_CHUNK]
+                cursor.execute(f"""
+                    SELECT i.interviewee_id AS user_id, i.email, ii.field_of_interest AS core_field
+                    FROM Interviewee i
+                    LEFT JOIN Interviewee_Interests ii ON i.interviewee_id = ii.interviewee_id
+                    WHERE i.interviewee_id IN ({",".join("?" * len(chunk))})
+                    ORDER BY i.interviewee_id, ii.id
+                """, chunk)
+                for row in cursor.fetchall():
+                    interviewees.setdefault(row['user_id'], row)
+        return interviewees
+
+    def generate_schedule(self, mode="greedy", workers=1):
+        """Schedule every interviewee: "greedy" gives each their best interviewer, "batch" solves an assignment.
+
+        Batch mode, or workers > 1, solves the field partitions separately (on a process pool if workers > 1)."""
+        first_booking = len(self.schedule)
+        if mode == "batch" or workers > 1:
+            self._generate_partitioned_schedule(mode, workers)
+        else:
+            self._generate_greedy_schedule()
+        lost = self._confirm_claims(first_booking)
+        if lost:
+            print(f"⚠️ {len(lost)} bookings lost their slot to another worker; run the schedule again to place them.")
+
+    def _generate_greedy_schedule(self):
         scheduled_interviewees = set()
         for interviewee in DataLoader.get_interviewees():
             interviewee_id = interviewee['user_id']
@@ -111,43 +249,240 @@ class InterviewScheduler:
 
         print(f"✅ Generated schedule with {len(self.schedule)} interviews.")
 
+    def _generate_partitioned_schedule(self, mode, workers):
+        """Solves the field partitions in rounds, each candidate in their next partition, and merges the bookings."""
+        interviewees = [
+            interviewee for interviewee in DataLoader.get_interviewees()
+            if str(interviewee['core_field'] or "").lower() in self.registry.field_code_index
+        ]
+        fields = [str(interviewee['core_field'] or "").lower() for interviewee in interviewees]
+        candidate_ids = [interviewee['user_id'] for interviewee in interviewees]
+        emails = {}
+        for interviewee in interviewees:
+            emails.setdefault(interviewee['user_id'], interviewee['email'])
+        partition_of_field, partition_interviewers = self._field_partitions()
+        interviewer_emails = dict(zip(reversed(self.registry.ids), reversed(self.registry.emails)))
+
+        # Per row: its partition column of each interviewer of its field, and which of them are eligible.
+        # Batch mode weighs every eligible pair, so it scores from the full matrices, not the best-pair stores.
+        full_scores = self._full_scores(interviewees) if mode == "batch" else None
+        row_columns, row_eligible, row_combined = self._row_scores(interviewees, fields, partition_of_field,
+                                                                   partition_interviewers, full_scores)
+        candidate_partitions = {}
+        for k, candidate_id in enumerate(candidate_ids):
+            if row_eligible[k].any():
+                partitions = candidate_partitions.setdefault(candidate_id, [])
+                if partition_of_field[fields[k]] not in partitions:
+                    partitions.append(partition_of_field[fields[k]])
+
+        scheduled_interviewees = set()
+        partitions_solved = 0
+        rounds = 0
+        pool = None
+        try:
+            while True:
+                round_rows = {}
+                for k, candidate_id in enumerate(candidate_ids):
+                    partitions = candidate_partitions.get(candidate_id)
+                    if (candidate_id in scheduled_interviewees or not partitions or rounds >= len(partitions)
+                            or partition_of_field[fields[k]] != partitions[rounds] or not row_eligible[k].any()):
+                        continue
+                    round_rows.setdefault(partitions[rounds], []).append(k)
+                if not round_rows:
+                    break
+                rounds += 1
+
+                jobs = []
+                for partition, rows in round_rows.items():
+                    interviewer_ids = partition_interviewers[partition]
+                    job_ids, eligible, combined = self._partition_problem(
+                        mode, rows, candidate_ids, len(interviewer_ids), row_columns, row_eligible, row_combined)
+                    jobs.append((mode, interviewer_ids, job_ids, eligible, combined,
+                                 self.available_slots.subset(interviewer_ids)))
+                if workers > 1 and len(jobs) > 1:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=workers)
+                    results = list(pool.map(solve_partition, *zip(*jobs)))
+                else:
+                    results = [solve_partition(*job) for job in jobs]
+                partitions_solved += len(jobs)
+
+                for (_, interviewer_ids, job_ids, _, _, _), bookings in zip(jobs, results):
+                    for k, j, slot in bookings:
+                        candidate_id, interviewer_id = job_ids[k], interviewer_ids[j]
+                        self.available_slots.mark_taken(interviewer_id, slot["Date"], slot["Start_Time"])
+                        self._book(candidate_id, emails[candidate_id], interviewer_id, interviewer_emails[interviewer_id],
+                                   slot, scheduled_interviewees)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        print(f"✅ Generated {mode} schedule with {len(self.schedule)} interviews: {partitions_solved} field "
+              f"partitions solved in {rounds} rounds.")
+
+    def _field_partitions(self):
+        """Groups fields that share an interviewer; returns ({field: partition}, [interviewer ids per partition])."""
+        interviewer_fields = {}
+        for interviewer_id, field in zip(self.registry.ids, self.registry.fields):
+            interviewer_fields.setdefault(interviewer_id, set()).add(field)
+        parent = {field: field for field in self.registry.fields}
+
+        def find(field):
+            while parent[field] != field:
+                parent[field] = parent[parent[field]]
+                field = parent[field]
+            return field
+
+        for fields in interviewer_fields.values():
+            fields = [find(field) for field in fields]
+            for field in fields[1:]:
+                parent[field] = fields[0]
+
+        roots = {}
+        partition_of_field = {field: roots.setdefault(find(field), len(roots)) for field in parent}
+        partition_interviewers = [[] for _ in roots]
+        for interviewer_id, fields in interviewer_fields.items():
+            partition_interviewers[partition_of_field[next(iter(fields))]].append(interviewer_id)
+        return partition_of_field, partition_interviewers
+
+    def _full_scores(self, interviewees):
+        """Distinct-signature similarity and matching scores of `interviewees`, as [(scores, row_of)]; -1 = none."""
+        vectorizer, interviewer_tfidf = SimilarityCalculator.fit_interviewers(self.interviewers)
+        similarity, inverse, _ = SimilarityCalculator.score_interviewees(vectorizer, interviewer_tfidf, interviewees)
+        # Interviewees with an empty field get no similarity row
+        scored = np.array([bool(str(interviewee['core_field'] or "").strip()) for interviewee in interviewees], dtype=bool)
+        similarity_row_of = np.full(len(interviewees), -1, dtype=np.int64)
+        similarity_row_of[scored] = inverse
+
+        matching, matching_row_of, _ = MatchingService.score_interviewees(
+            self.registry.ids, self.registry.fields, SkillIndex.load(), interviewees)
+        return [(similarity, similarity_row_of), (matching, np.asarray(matching_row_of, dtype=np.int64))]
+
+    def _row_scores(self, interviewees, fields, partition_of_field, partition_interviewers, full_scores=None):
+        """Per interviewee row: partition columns of its field's interviewers, their eligibility and combined score."""
+        column_of = [{interviewer_id: j for j, interviewer_id in enumerate(interviewer_ids)}
+                     for interviewer_ids in partition_interviewers]
+        rows_by_field = {}
+        for k, field in enumerate(fields):
+            rows_by_field.setdefault(field, []).append(k)
+
+        row_columns, row_eligible, row_combined = [None] * len(fields), [None] * len(fields), [None] * len(fields)
+        for field, rows in rows_by_field.items():
+            registry_rows = self.registry.rows_for_field(field)
+            interviewer_ids = [self.registry.ids[row] for row in registry_rows]
+            columns = np.array([column_of[partition_of_field[field]][i] for i in interviewer_ids], dtype=np.int64)
+            if full_scores is None:
+                candidate_ids = [interviewees[k]['user_id'] for k in rows]
+                sim = self._store_block(self.similarity_scores, candidate_ids, interviewer_ids)
+                match = self._store_block(self.matching_scores, candidate_ids, interviewer_ids)
+            else:
+                sim, match = (self._full_block(scores, row_of[rows], registry_rows) for scores, row_of in full_scores)
+            eligible = (sim > 0) & (match > 0)
+            combined = sim.astype(np.float64) + match
+            for position, k in enumerate(rows):
+                row_columns[k], row_eligible[k], row_combined[k] = columns, eligible[position], combined[position]
+        return row_columns, row_eligible, row_combined
+
+    @staticmethod
+    def _store_block(store, row_ids, column_ids):
+        """(rows × columns) scores of a ScoreStore; unknown ids read as 0."""
+        if not store.row_index or not store.column_index:
+            return np.zeros((len(row_ids), len(column_ids)), dtype=np.float32)
+        rows = np.array([store.row_index.get(row_id, -1) for row_id in row_ids], dtype=np.int64)
+        columns = np.array([store.column_index.get(column_id, -1) for column_id in column_ids], dtype=np.int64)
+        block = store.values[np.maximum(rows, 0)][:, np.maximum(columns, 0)]
+        block[rows < 0] = 0
+        block[:, columns < 0] = 0
+        return block
+
+    @staticmethod
+    def _full_block(distinct_scores, row_of, columns):
+        """(rows × columns) block of a distinct-signature score matrix; rows without scores read as 0."""
+        if not len(distinct_scores):
+            return np.zeros((len(row_of), len(columns)))
+        block = distinct_scores[np.maximum(row_of, 0)][:, columns]
+        block[row_of < 0] = 0
+        return block
+
+    @staticmethod
+    def _partition_problem(mode, rows, candidate_ids, n_interviewers, row_columns, row_eligible, row_combined):
+        """(candidate ids, eligible, combined) of one partition's rows; batch mode merges a candidate's rows."""
+        if mode == "batch":
+            keys = list(dict.fromkeys(candidate_ids[k] for k in rows))
+        else:
+            keys = [candidate_ids[k] for k in rows]
+        position = {candidate_id: i for i, candidate_id in enumerate(keys)}
+        eligible = np.zeros((len(keys), n_interviewers), dtype=bool)
+        combined = np.zeros((len(keys), n_interviewers))
+        for i, k in enumerate(rows):
+            target = position[candidate_ids[k]] if mode == "batch" else i
+            columns = row_columns[k][row_eligible[k]]
+            scores = row_combined[k][row_eligible[k]]
+            eligible[target, columns] = True
+            # A candidate's fields can share an interviewer, so keep the best score per column
+            np.maximum.at(combined[target], columns, scores)
+        return keys, eligible, combined
+
     def schedule_single_candidate(self, candidate_id):
         """Schedule an interview for a single candidate using pre-allocated slots."""
-        with sqlite3.connect(DataLoader.DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT i.interviewee_id AS user_id, i.email, ii.field_of_interest AS core_field
-                FROM Interviewee i
-                LEFT JOIN Interviewee_Interests ii ON i.interviewee_id = ii.interviewee_id
-                WHERE i.interviewee_id = ?
-            """, (candidate_id,))
-            interviewee = cursor.fetchone()
-            if not interviewee:
-                print(f"❌ Candidate {candidate_id} not found.")
-                return
-
-        self._schedule_candidate(candidate_id, interviewee['core_field'], interviewee['email'], set())
+        self.schedule_candidates([candidate_id])
+
+    def schedule_candidates(self, candidate_ids):
+        """Schedule a micro-batch of new candidates in order, looking them all up with one query."""
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+        if not candidate_ids:
+            return
+        interviewees = self._lookup_candidates(candidate_ids)
+
+        scheduled_interviewees = set()
+        pending = candidate_ids
+        while pending:
+            first_booking = len(self.schedule)
+            try:
+                for candidate_id in pending:
+                    interviewee = interviewees.get(candidate_id)
+                    if not interviewee:
+                        print(f"❌ Candidate {candidate_id} not found.")
+                        continue
+                    self._schedule_candidate(candidate_id, interviewee['core_field'], interviewee['email'],
+                                             scheduled_interviewees)
+                # Candidates whose slot another worker took first try again against the re-synced calendar.
+                # Every lost claim marks at least that slot taken, so this ends once slots run out.
+                pending = self._confirm_claims(first_booking)
+            except Exception:
+                self._discard_unconfirmed(first_booking)
+                raise
+            scheduled_interviewees.difference_update(pending)
+
+    def _discard_unconfirmed(self, first_booking):
+        """Drops bookings made since `first_booking` that were never claimed, and re-reads their interviewers' slots."""
+        unconfirmed = self.schedule[first_booking:]
+        del self.schedule[first_booking:]
+        if unconfirmed:
+            self._resync_slots(dict.fromkeys(entry["Interviewer_ID"] for entry in unconfirmed))
 
     def _schedule_candidate(self, candidate_id, core_field, email, scheduled_interviewees):
         """Helper method to schedule a candidate."""
         interviewee_field = str(core_field or "").lower()
+        sim_row = self.similarity_scores.row(candidate_id)
+        match_row = self.matching_scores.row(candidate_id)
+        if sim_row is None or match_row is None:
+            print(f"❌ No matching interviewers for {candidate_id}")
+            return
+
+        # Only interviewers in the candidate's own field are eligible, so skip straight to them
         matching_interviewers = []
-        for _, interviewer in self.interviewers.iterrows():
-            interviewer_id = interviewer['interviewer_id']
-            interviewer_field = str(interviewer['field_of_expertise'] or "").lower()
-            if interviewee_field != interviewer_field:
-                continue
-            pair = (candidate_id, interviewer_id)
-            sim_score = self.similarity_scores.get(pair, 0)
-            match_score = self.matching_scores.get(pair, 0)
+        for row in self.registry.rows_for_field(interviewee_field):
+            interviewer_id = self.registry.ids[row]
+            sim_score = sim_row[self.similarity_scores.column_index[interviewer_id]]
+            match_score = match_row[self.matching_scores.column_index[interviewer_id]]
             if sim_score == 0 or match_score == 0:
                 continue
-            combined_score = sim_score + match_score
+            combined_score = float(sim_score) + float(match_score)
             matching_interviewers.append({
                 'interviewer_id': interviewer_id,
                 'combined_score': combined_score,
-                'email': interviewer['email']
+                'email': self.registry.emails[row]
             })
 
         if not matching_interviewers:
@@ -159,11 +494,33 @@ class InterviewScheduler:
         interviewer_id = best_interviewer['interviewer_id']
         interviewer_email = best_interviewer['email']
 
-        if not self.available_slots[interviewer_id]:
+        slot = self.available_slots.claim(interviewer_id)  # Take the earliest slot
+        if slot is None:
             print(f"❌ No available slots for interviewer {interviewer_id}")
             return
 
-        slot = self.available_slots[interviewer_id].pop(0)  # Take the earliest slot
+        self._book(candidate_id, email, interviewer_id, interviewer_email, slot, scheduled_interviewees)
+
+    def _confirm_claims(self, first_booking):
+        """Claims and stores the bookings made since `first_booking`; returns the candidates whose slot was lost."""
+        new_bookings = self.schedule[first_booking:]
+        if not new_bookings:
+            return []
+        claimed = self.slot_store.book_slots(
+            (entry["Interviewer_ID"], entry["Date"], entry["Start_Time"], entry["End_Time"], entry["Interviewee_ID"],
+             entry["Interviewer_Email"], entry["Interviewee_Email"])
+            for entry in new_bookings
+        )
+        self.schedule[first_booking:] = [entry for entry, ok in zip(new_bookings, claimed) if ok]
+        lost = [entry for entry, ok in zip(new_bookings, claimed) if not ok]
+        for entry in lost:
+            print(f"⚠️ Slot {entry['Date']} {entry['Start_Time']} of {entry['Interviewer_ID']} was taken by another "
+                  f"worker before {entry['Interviewee_ID']} could claim it")
+        if lost:
+            self._resync_slots(dict.fromkeys(entry["Interviewer_ID"] for entry in lost))
+        return [entry["Interviewee_ID"] for entry in lost]
+
+    def _book(self, candidate_id, email, interviewer_id, interviewer_email, slot, scheduled_interviewees):
         self.schedule.append({
             "Date": slot["Date"],
             "Start_Time": slot["Start_Time"],
@@ -177,15 +534,68 @@ class InterviewScheduler:
         print(f"✅ Scheduled {candidate_id} with {interviewer_id} on {slot['Date']} {slot['Start_Time']}")
 
     def store_schedule_in_db(self):
-        try:
-            conn = sqlite3.connect(DataLoader.DB_PATH)
-            df_schedule = pd.DataFrame(self.schedule)
-            df_schedule = df_schedule.rename(columns={"Date": "date", "Start_Time": "time"})
-            df_schedule["time"] = df_schedule["time"] + "-" + df_schedule["End_Time"]
-            df_schedule = df_schedule.drop(columns=["End_Time"])
-            df_schedule.to_sql('interview_schedule', conn, if_exists='append', index=False)
-            conn.close()
-            self.schedule.clear()  # Clear after storing to avoid duplicates
-            print("✅ Schedule stored in database.")
-        except Exception as e:
-            print(f"❌ Error storing schedule: {e}")
\ No newline at end of file
+        """Clears the pending bookings, already written with their slot claims; returns how many there were."""
+        stored = len(self.schedule)
+        self.schedule.clear()
+        if stored:
+            print(f"✅ Schedule stored in database: {stored} rows.")
+        return stored
+
+
+def solve_partition(mode, interviewer_ids, candidate_ids, eligible, combined, calendar):
+    """Schedules one partition's rows on its interviewers in a worker process; returns (row, column, slot) bookings."""
+    if mode == "batch":
+        return _batch_assign(interviewer_ids, combined, eligible, calendar)
+
+    # Rows are in get_interviewees order, so this replays the sequential greedy pass
+    bookings = []
+    scheduled = set()
+    for k, candidate_id in enumerate(candidate_ids):
+        if candidate_id in scheduled:
+            continue
+        candidates = np.flatnonzero(eligible[k])
+        if not candidates.size:
+            continue
+        best = min(candidates, key=lambda j: (-combined[k, j], interviewer_ids[j]))
+        slot = calendar.claim(interviewer_ids[best])
+        if slot is not None:
+            bookings.append((k, int(best), slot))
+            scheduled.add(candidate_id)
+    return bookings
+
+
+def _batch_assign(interviewer_ids, combined, eligible, calendar):
+    """Sparse min-cost matching of candidates to the free slots of their eligible interviewers."""
+    if not eligible.any():
+        return []
+    n_candidates = len(combined)
+    capacity = np.minimum([calendar.free_slots(i) for i in interviewer_ids], eligible.sum(axis=0))
+    column_start = np.concatenate([[0], np.cumsum(capacity)])
+    # Scores are at most 2, so every edge cost stays positive; the matching treats zero weights as missing
+    base = float(combined[eligible].max()) + 1
+
+    rows, columns, costs = [], [], []
+    for j in np.flatnonzero(capacity):
+        candidates = np.flatnonzero(eligible[:, j])
+        ranks = np.arange(capacity[j])
+        rows.append(np.repeat(candidates, len(ranks)))
+        columns.append(column_start[j] + np.tile(ranks, len(candidates)))
+        costs.append(np.repeat(base - combined[candidates, j], len(ranks)) + LOAD_PENALTY * np.tile(ranks, len(candidates)))
+    unassigned = np.arange(n_candidates)
+    rows.append(unassigned)
+    columns.append(column_start[-1] + unassigned)
+    costs.append(np.full(n_candidates, INELIGIBLE_COST))
+    graph = sparse.csr_matrix((np.concatenate(costs), (np.concatenate(rows), np.concatenate(columns))),
+                              shape=(n_candidates, column_start[-1] + n_candidates))
+    assigned_rows, assigned_columns = min_weight_full_bipartite_matching(graph)
+
+    column_interviewer = np.repeat(np.arange(len(interviewer_ids)), capacity)
+    bookings = []
+    for k, column in zip(assigned_rows, assigned_columns):
+        if column >= column_start[-1]:
+            continue
+        j = int(column_interviewer[column])
+        slot = calendar.claim(interviewer_ids[j])
+        if slot is not None:
+            bookings.append((int(k), j, slot))
+    return bookings
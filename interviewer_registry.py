@@ -0,0 +1,35 @@
+import numpy as np
+from skill_index import code_values
+
+class InterviewerRegistry:
+    """Columnar view of the interviewer rows with a prebuilt field → interviewer index.
+
+    Row i describes the i-th row of DataLoader.load_interviewers(): an interviewer
+    with several expertise fields appears once per field, just as in the DataFrame.
+    Fields are normalized (lowercased) once here instead of on every scheduling pass.
+    """
+    __slots__ = ("ids", "emails", "fields", "field_codes", "field_code_index", "rows_by_field")
+
+    def __init__(self, interviewers_df):
+        self.ids = interviewers_df["interviewer_id"].tolist()
+        self.emails = interviewers_df["email"].tolist()
+        self.fields = [str(field or "").lower() for field in interviewers_df["field_of_expertise"]]
+        self.field_codes, self.field_code_index = code_values(self.fields)
+        rows_by_code = {}
+        for row, code in enumerate(self.field_codes):
+            rows_by_code.setdefault(int(code), []).append(row)
+        self.rows_by_field = {code: np.array(rows, dtype=np.int64) for code, rows in rows_by_code.items()}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def unique_ids(self):
+        """Interviewer ids in first-seen order, without the repeats from multi-field interviewers."""
+        return list(dict.fromkeys(self.ids))
+
+    def rows_for_field(self, field):
+        """Row indices of interviewers whose normalized field equals `field` (already lowercased)."""
+        code = self.field_code_index.get(field)
+        if code is None:
+            return np.zeros(0, dtype=np.int64)
+        return self.rows_by_field[code]
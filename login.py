@@ -11,6 +11,8 @@ from cossimilarity import SimilarityCalculator
 from matching import MatchingService
 from interview_scheduler import InterviewScheduler
 from password import send_otp, generate_candidate_id, store_candidate_data
+from upload_store import ParseCache, UploadStore
+import db
 
 app = Flask(
     __name__,
@@ -21,14 +23,13 @@ app = Flask(
 limiter = Limiter(app=app, key_func=get_remote_address)
 
 otp_storage = {}
-DB_PATH = r"C:\Users\Sudhindra Prakash\Desktop\java project\.venv\Backend\DRDO_Normalized_Updated_Names.db"
 UPLOAD_FOLDER = "uploads"
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 def init_db():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    os.makedirs(os.path.dirname(db.DB_PATH), exist_ok=True)
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = db.connect()
         cursor = conn.cursor()
         # Adjusted schema to match CSV tables
         cursor.execute("""
@@ -74,10 +75,10 @@ def init_db():
         print("✅ Database initialized successfully.")
     except sqlite3.Error as e:
         print(f"❌ Error initializing database: {e}")
-    finally:
-        conn.close()
 
 init_db()
+uploads = UploadStore(UPLOAD_FOLDER)
+parse_cache = ParseCache()
 
 def validate_phone_number(phone_number):
     pattern = r'^\d{10}$'
@@ -153,11 +154,10 @@ def expert_dashboard():
     if not user_id:
         return "Invalid user ID", 400
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = db.connect()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM interview_schedule WHERE Interviewer_ID=?", (user_id,))
         schedule = cursor.fetchall()
-        conn.close()
         print(f"✅ Loaded schedule for expert {user_id}: {len(schedule)} entries")
         return render_template('Expert_Dashboard.html', schedule=schedule)
     except sqlite3.Error as e:
@@ -170,11 +170,10 @@ def candidate_dashboard():
     if not user_id:
         return "Invalid user ID", 400
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = db.connect()
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM interview_schedule WHERE Interviewee_ID=?", (user_id,))
         schedule = cursor.fetchall()
-        conn.close()
         print(f"✅ Loaded schedule for candidate {user_id}: {len(schedule)} entries")
         return render_template('Interviewee_dashboard.html', schedule=schedule)
     except sqlite3.Error as e:
@@ -196,12 +195,14 @@ def candidate_signup():
         user_id = generate_candidate_id()
         filename = secure_filename(resume.filename)
         timestamp = int(time.time())
-        file_path = os.path.join(UPLOAD_FOLDER, f"{user_id}_{timestamp}_{filename}")
-        resume.save(file_path)
+        content_hash, file_path = uploads.save(resume.stream, f"{user_id}_{timestamp}_{filename}")
 
         try:
-            print(f"✅ Parsing resume at path: {file_path}")
-            parsed_data = ResumeParserService.parse_resume(file_path)
+            parsed_data = parse_cache.get(content_hash, 1150)
+            if parsed_data is None:
+                print(f"✅ Parsing resume at path: {file_path}")
+                parsed_data = ResumeParserService.parse_resume(file_path, min_gate_score=1150)
+                parse_cache.put(content_hash, parsed_data)
 
             name = parsed_data.get("name", "Candidate")
             email = parsed_data.get("email", "unknown@example.com")
@@ -1,43 +1,95 @@
+import numpy as np
 from dataload import DataLoader
+from score_store import best_pairs
+from skill_index import SignatureCache, SkillIndex, code_values
 from sklearn.linear_model import LinearRegression
 from cossimilarity import SimilarityCalculator
 
 class MatchingService:
     """Computes matching scores using live interviewee data."""
 
+    signature_stats = SignatureCache()
+
+    @staticmethod
+    def prepare_interviewers(interviewers_df):
+        """Returns (interviewer_ids, lowercased interviewer fields) in DataFrame row order."""
+        interviewer_ids = interviewers_df["interviewer_id"].tolist()
+        interviewer_fields = [str(field or "").lower() for field in interviewers_df["field_of_expertise"]]
+        return interviewer_ids, interviewer_fields
+
+    @staticmethod
+    def score_interviewees(interviewer_ids, interviewer_fields, skill_index, interviewees):
+        """Scores each distinct (field, skills) signature among `interviewees` once against every interviewer.
+
+        Returns (distinct_scores, inverse, interviewee_ids), where row inverse[i] of
+        distinct_scores holds interviewee i's scores. Each score is
+        0.6 * field match + 0.4 * skill overlap.
+        """
+        interviewee_ids, signatures = [], []
+        for interviewee in interviewees:
+            interviewee_ids.append(interviewee["user_id"])
+            signatures.append((str(interviewee["core_field"] or "").lower(), skill_index.get(interviewee["user_id"])))
+
+        inverse, distinct_signatures = code_values(signatures)
+        distinct_fields = [field for field, _ in distinct_signatures]
+        distinct_skills = [skills for _, skills in distinct_signatures]
+
+        interviewee_skills = skill_index.incidence_from_sets(distinct_skills)
+        interviewer_skills = skill_index.incidence_matrix(interviewer_ids)
+        common_skills = (interviewee_skills @ interviewer_skills.T).toarray()
+        skill_counts = np.array([len(skills) for skills in distinct_skills], dtype=np.int64)
+        skill_score = common_skills / np.maximum(skill_counts, 1)[:, None]
+
+        interviewer_codes, field_codes = code_values(interviewer_fields)
+        interviewee_codes, _ = code_values(distinct_fields, field_codes)
+        field_score = (interviewee_codes[:, None] == interviewer_codes[None, :]).astype(np.float64)
+
+        distinct_scores = 0.6 * field_score + 0.4 * skill_score
+        return distinct_scores, inverse, interviewee_ids
+
     @staticmethod
-    def compute_matching_scores():
+    def _distinct_matching():
+        """Returns (distinct_scores, inverse, interviewee_ids, interviewer_ids) for every interviewee."""
         interviewers_df = DataLoader.load_interviewers()
         if interviewers_df.empty:
             print("❌ No interviewer data for matching score computation.")
-            return {}
-
-        matching_scores = {}
-        for interviewee in DataLoader.get_interviewees():
-            interviewee_id = interviewee["user_id"]
-            interviewee_skills = DataLoader.get_skills_for_user(interviewee_id)
-            interviewee_field = str(interviewee["core_field"] or "").lower()
-
-            max_score = 0
-            best_interviewer = None
-            for _, interviewer in interviewers_df.iterrows():
-                interviewer_id = interviewer["interviewer_id"]
-                interviewer_skills = DataLoader.get_skills_for_user(interviewer_id)
-                interviewer_field = str(interviewer["field_of_expertise"] or "").lower()
-
-                common_skills = len(interviewee_skills & interviewer_skills)
-                skill_score = common_skills / max(len(interviewee_skills), 1)
-                field_score = 1.0 if interviewee_field == interviewer_field else 0.0
-                combined_score = 0.6 * field_score + 0.4 * skill_score
-
-                if combined_score > max_score:
-                    max_score = combined_score
-                    best_interviewer = interviewer_id
-
-            if best_interviewer:
-                matching_scores[(interviewee_id, best_interviewer)] = max_score
-
-        print(f"✅ Computed matching scores for {len(matching_scores)} pairs.")
+            return np.zeros((0, 0)), np.zeros(0, dtype=np.int64), [], []
+
+        interviewer_ids, interviewer_fields = MatchingService.prepare_interviewers(interviewers_df)
+        distinct_scores, inverse, interviewee_ids = MatchingService.score_interviewees(
+            interviewer_ids, interviewer_fields, SkillIndex.load(), DataLoader.get_interviewees()
+        )
+        MatchingService.signature_stats.record_batch(len(inverse), len(distinct_scores))
+        return distinct_scores, inverse, interviewee_ids, interviewer_ids
+
+    @staticmethod
+    def compute_matching_matrix():
+        """Scores every interviewee against every interviewer.
+
+        Returns (scores, interviewee_ids, interviewer_ids), where scores[i, j] is the
+        matching score between interviewee row i and interviewer row j.
+        """
+        distinct_scores, inverse, interviewee_ids, interviewer_ids = MatchingService._distinct_matching()
+        return distinct_scores[inverse], interviewee_ids, interviewer_ids
+
+    @staticmethod
+    def compute_matching_scores(shard_size=None, workers=1, progress=None):
+        """Best-matching interviewer per interviewee as {(interviewee_id, interviewer_id): score}.
+
+        With a `shard_size`, interviewees are scored in id-range shards on `workers`
+        processes so memory stays bounded by the shard size (see sharded_scoring).
+        """
+        if shard_size:
+            from sharded_scoring import ShardedScorer
+            matching_scores = ShardedScorer(shard_size, workers, progress).matching()
+        else:
+            distinct_scores, inverse, interviewee_ids, interviewer_ids = MatchingService._distinct_matching()
+            if not interviewer_ids:
+                return {}
+            matching_scores = best_pairs(distinct_scores, inverse, interviewee_ids, interviewer_ids)
+
+        hit_ratio = MatchingService.signature_stats.hit_ratio
+        print(f"✅ Computed matching scores for {len(matching_scores)} pairs (signature cache hit ratio {hit_ratio:.1%}).")
         return matching_scores
 
     @staticmethod
@@ -51,7 +103,7 @@ class MatchingService:
             return None
 
         X, y = [], []
-        all_pairs = set(cosine_scores.keys()) & set(jaccard_scores.keys()) & set(matching_scores.keys())
+        all_pairs = [pair for pair in cosine_scores.keys() & matching_scores.keys() if pair in jaccard_scores]
         for pair in all_pairs:
             cosine = cosine_scores.get(pair, 0)
             jaccard = jaccard_scores.get(pair, 0)
@@ -2,13 +2,13 @@ import os
 import random
 import sqlite3
 import requests
+import db
 from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 # Load environment variables from .env file
 load_dotenv(r"C:\Users\Sudhindra Prakash\Desktop\java project\.venv\.env")
 
-DB_PATH = r"C:\Users\Sudhindra Prakash\Desktop\java project\.venv\Backend\DRDO_Normalized_Updated_Names.db"
 FAST2SMS_API_KEY = os.getenv("FAST2SMS_API_KEY")
 print(f"DEBUG: Loaded FAST2SMS_API_KEY = {FAST2SMS_API_KEY if FAST2SMS_API_KEY else 'Not Found'}")
 
@@ -83,29 +83,39 @@ def send_otp(phone_number, role):
         return response  # Propagate the error without fallback
 
 def generate_candidate_id():
-    with sqlite3.connect(DB_PATH, timeout=10) as conn:
+    with db.connect() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM Interviewee")
         count = cursor.fetchone()[0]
         candidate_id = f"CAND{count + 1:04d}"
     return candidate_id
 
+def insert_candidates(conn, candidates):
+    """Writes (candidate_id, name, email, phone, core_field) rows on `conn` without committing,
+    so a caller can put many candidates in one transaction.
+
+    An existing candidate is updated in place. This is an UPDATE plus an INSERT ... WHERE NOT
+    EXISTS rather than an upsert, since the shipped Interviewee table has no primary key for
+    ON CONFLICT to use. Interests are numbered on from MAX(id), read once per call after
+    the Interviewee writes have taken the write lock; their ids fix their order.
+    """
+    candidates = list(candidates)
+    conn.executemany("""
+        UPDATE Interviewee SET name = ?, email = ?, phone = ? WHERE interviewee_id = ?
+    """, [(name, email, phone, candidate_id) for candidate_id, name, email, phone, _ in candidates])
+    conn.executemany("""
+        INSERT INTO Interviewee (interviewee_id, name, email, phone)
+        SELECT ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM Interviewee WHERE interviewee_id = ?)
+    """, [candidate[:4] + (candidate[0],) for candidate in candidates])
+    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM Interviewee_Interests").fetchone()[0]
+    conn.executemany("""
+        INSERT INTO Interviewee_Interests (id, interviewee_id, field_of_interest) VALUES (?, ?, ?)
+    """, [(next_id + i, candidate[0], candidate[4]) for i, candidate in enumerate(candidates)])
+
 def store_candidate_data(candidate_id, name, email, phone, age, experience, gate_score, core_field):
     try:
-        with sqlite3.connect(DB_PATH, timeout=10) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO Interviewee (interviewee_id, name, email, phone)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(interviewee_id) DO UPDATE SET 
-                    name = excluded.name,
-                    email = excluded.email,
-                    phone = excluded.phone
-            """, (candidate_id, name, email, phone))
-            cursor.execute("""
-                INSERT INTO Interviewee_Interests (interviewee_id, field_of_interest)
-                VALUES (?, ?)
-            """, (candidate_id, core_field))
+        with db.connect() as conn:
+            insert_candidates(conn, [(candidate_id, name, email, phone, core_field)])
             conn.commit()
         print(f"✅ Candidate {candidate_id} data stored successfully.")
     except sqlite3.Error as e:
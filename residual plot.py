@@ -76,7 +76,7 @@ def plot_matching_score_residuals():
             return
 
         X, y_true_list = [], []
-        all_pairs = set(cosine_scores.keys()) & set(jaccard_scores.keys()) & set(matching_scores.keys())
+        all_pairs = [pair for pair in cosine_scores.keys() & matching_scores.keys() if pair in jaccard_scores]
         
         if not all_pairs:
             print("❌ No common (interviewee, interviewer) pairs found across all scoring methods.")
@@ -0,0 +1,183 @@
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+import db
+from password import store_candidate_data
+from resume_parser import ResumeParserService
+from upload_store import UPLOAD_FOLDER, ParseCache, UploadStore
+
+MIN_GATE_SCORE = 1150
+DEFAULT_PARSE_WORKERS = 2
+
+
+def init_parse_worker():
+    # An exception here would break the whole pool; without the models the worker still
+    # extracts every field with the regex tiers
+    try:
+        ResumeParserService.warm_models()
+    except Exception as e:
+        ResumeParserService.nlp_available = False
+        print(f"⚠️ Parse worker {os.getpid()} could not load the NLP models, using regex extraction only: {e}")
+
+
+def _warm():
+    return os.getpid()
+
+
+def parse_resume_file(file_path):
+    # Below the minimum GATE score the parser stops before running pyresparser
+    parsed = ResumeParserService.parse_resume(file_path, min_gate_score=MIN_GATE_SCORE)
+    parsed.pop("full_text", None)  # Large and unused once the fields are extracted
+    return parsed
+
+
+class ResumeJobService:
+    """Parses signup resumes on a process pool and tracks each signup as a job.
+
+    Pool workers load the pyresparser/spaCy models once, when they start. A signup
+    reserves a candidate id and a job id, hands the PDF to the pool and returns at once.
+    When parsing finishes the job becomes "rejected" (GATE score too low) or "parsed"
+    (stored and queued for scheduling), and "scheduled" once the scheduling worker has
+    booked the interview. Job state lives in the signup_jobs table, so any app process
+    can answer a status request. Uploads are stored by content hash, and a resume parsed
+    before is taken from the parse cache without going to the pool.
+    """
+
+    def __init__(self, scheduling_worker, workers=DEFAULT_PARSE_WORKERS, upload_folder=UPLOAD_FOLDER):
+        self.scheduling_worker = scheduling_worker
+        self.uploads = UploadStore(upload_folder)
+        self.parse_cache = ParseCache()
+        with db.connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS signup_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    candidate_id TEXT UNIQUE,
+                    status TEXT NOT NULL,
+                    message TEXT,
+                    gate_score INTEGER,
+                    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=init_parse_worker)
+        # Start every worker now so the models are loaded before the first signup arrives
+        for _ in range(workers):
+            self.pool.submit(_warm)
+        scheduling_worker.on_scheduled = self.mark_scheduled
+        scheduling_worker.on_failed = self.mark_schedule_failed
+
+    def reserve(self):
+        """Creates a queued job with a fresh candidate id; returns (job_id, candidate_id)."""
+        job_id = uuid.uuid4().hex
+        with db.connect() as conn:
+            # IMMEDIATE takes the write lock up front, so concurrent signups never share an id
+            conn.execute("BEGIN IMMEDIATE")
+            number = conn.execute("SELECT COUNT(*) FROM Interviewee").fetchone()[0] + 1
+            while conn.execute("""
+                SELECT 1 FROM Interviewee WHERE interviewee_id = :id
+                UNION ALL SELECT 1 FROM signup_jobs WHERE candidate_id = :id
+            """, {"id": f"CAND{number:04d}"}).fetchone():
+                number += 1
+            candidate_id = f"CAND{number:04d}"
+            conn.execute(
+                "INSERT INTO signup_jobs (job_id, candidate_id, status, message) VALUES (?, ?, 'queued', ?)",
+                (job_id, candidate_id, "Your resume is waiting to be parsed.")
+            )
+        return job_id, candidate_id
+
+    def start(self, job_id, candidate_id, phone_number, stream, reference):
+        """Stores an uploaded resume and admits the candidate from the parse cache, or hands it to the parsing pool."""
+        content_hash, file_path = self.uploads.save(stream, reference)
+        parsed_data = self.parse_cache.get(content_hash, MIN_GATE_SCORE)
+        if parsed_data is not None:
+            print(f"✅ Parse cache hit for job {job_id}")
+            self._admit(job_id, candidate_id, phone_number, parsed_data)
+            return
+        future = self.pool.submit(parse_resume_file, file_path)
+        future.add_done_callback(
+            lambda done: self._finish(job_id, candidate_id, phone_number, content_hash, done))
+
+    def _finish(self, job_id, candidate_id, phone_number, content_hash, future):
+        try:
+            parsed_data = future.result()
+        except Exception as e:
+            print(f"❌ Error processing resume for job {job_id}: {e}")
+            self._update(job_id, "failed", "There was an error processing your resume. Please try again.")
+            return
+        self.parse_cache.put(content_hash, parsed_data)
+        # Tier stats are kept where they can be reported, not in the pool worker
+        ResumeParserService.extraction_stats.record(parsed_data.pop("extraction", None))
+        self._admit(job_id, candidate_id, phone_number, parsed_data)
+
+    def _admit(self, job_id, candidate_id, phone_number, parsed_data):
+        name = parsed_data.get("name", "Candidate")
+        email = parsed_data.get("email", "unknown@example.com")
+        age = parsed_data.get("age", 25)
+        experience = parsed_data.get("experience", 0)
+        gate_score = parsed_data.get("gate_score", 0)
+        core_field = parsed_data.get("core_field", "General")
+        print(f"✅ Extracted data: Name={name}, Email={email}, Gate={gate_score}, Core Field={core_field}")
+
+        if gate_score < MIN_GATE_SCORE:
+            self._update(job_id, "rejected",
+                         f"Your GATE score does not meet the minimum requirement of {MIN_GATE_SCORE} for DRDO.",
+                         gate_score)
+            return
+        try:
+            store_candidate_data(candidate_id, name, email, phone_number, age, experience, gate_score, core_field)
+        except Exception as e:
+            print(f"❌ Error storing candidate for job {job_id}: {e}")
+            self._update(job_id, "failed", "Database error: Unable to store your data. Please try again later.",
+                         gate_score)
+            return
+
+        self._update(job_id, "parsed", "Your interview is being scheduled.", gate_score)
+        if not self.scheduling_worker.submit(candidate_id, core_field):
+            self._update(job_id, "parsed", "Your interview will be scheduled in the next scheduling run.", gate_score)
+
+    def _update(self, job_id, status, message, gate_score=None):
+        with db.connect() as conn:
+            conn.execute("""
+                UPDATE signup_jobs
+                SET status = ?, message = ?, gate_score = COALESCE(?, gate_score), updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = ?
+            """, (status, message, gate_score, job_id))
+
+    def fail(self, job_id, message):
+        self._update(job_id, "failed", message)
+
+    def mark_scheduled(self, candidate_ids):
+        """Called by the scheduling worker with the candidates whose interviews it just stored."""
+        candidate_ids = list(candidate_ids)
+        with db.connect() as conn:
+            conn.execute(f"""
+                UPDATE signup_jobs
+                SET status = 'scheduled', message = 'Your interview is scheduled. See your dashboard.',
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'parsed' AND candidate_id IN ({",".join("?" * len(candidate_ids))})
+            """, candidate_ids)
+
+    def mark_schedule_failed(self, candidate_ids):
+        """Called by the scheduling worker with the candidates it could not schedule because of an error."""
+        candidate_ids = list(candidate_ids)
+        with db.connect() as conn:
+            conn.execute(f"""
+                UPDATE signup_jobs
+                SET status = 'failed',
+                    message = 'Your application was saved, but scheduling failed. Your interview will be scheduled in the next scheduling run.',
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'parsed' AND candidate_id IN ({",".join("?" * len(candidate_ids))})
+            """, candidate_ids)
+
+    @staticmethod
+    def status(job_id):
+        """The job as a dict, or None if there is no such job."""
+        with db.connect() as conn:
+            row = conn.execute("""
+                SELECT job_id, candidate_id, status, message, gate_score, created_at, updated_at
+                FROM signup_jobs WHERE job_id = ?
+            """, (job_id,)).fetchone()
+        if row is None:
+            return None
+        keys = ("job_id", "candidate_id", "status", "message", "gate_score", "created_at", "updated_at")
+        return dict(zip(keys, row))
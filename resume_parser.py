@@ -1,5 +1,7 @@
 import os
-import sqlite3
+import threading
+import time
+import db
 import pdfplumber
 import re
 from pyresparser import ResumeParser
@@ -8,8 +10,145 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 
+NAME_PATTERN = re.compile(r'Name\s*:\s*(.+?)(?:\n|$)', re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERN = re.compile(r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b')
+GATE_PATTERN = re.compile(r'GATE\s+Score\s*(?:\n\s*)?Score\s*[:=]\s*(\d{3,4})', re.IGNORECASE)
+# "3 years of experience", "Experience: 2.5 yrs"
+EXPERIENCE_PATTERN = re.compile(
+    r'(\d{1,2}(?:\.\d+)?)\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:\w+\s+)?experience'
+    r'|experience\s*[:\-]\s*(\d{1,2}(?:\.\d+)?)\+?\s*(?:years?|yrs?)',
+    re.IGNORECASE
+)
+DEFAULT_CORE_FIELD = "General Engineering"
+FIELD_KEYWORDS = {
+    "Aerospace": ["aerospace", "aeronautical", "aviation", "avionics"],
+    "Computer Science": ["computer science", "cs", "cse", "information technology", "it"],
+    "Electronics": ["electronics", "ece", "eee", "electrical", "communication"],
+    "Mechanical": ["mechanical", "mech", "production engineering", "automobile"],
+    "Civil": ["civil engineering", "civil", "structural engineering"],
+    "Chemical": ["chemical", "chem", "petroleum", "petrochemical"],
+    "Biotechnology": ["biotechnology", "biotech", "biomedical", "biochemical"],
+    "Physics": ["physics", "applied physics"],
+    "Mathematics": ["mathematics", "math", "applied mathematics", "statistics"],
+    "Medical": ["medicine", "medical", "mbbs", "md", "surgery"]
+}
+# keyword -> (field, number of words)
+KEYWORD_FIELDS = {keyword: (field, len(keyword.split()))
+                  for field, keywords in FIELD_KEYWORDS.items() for keyword in keywords}
+# Keywords this short are acronyms ("IT", "CS", "MD") and only match in capitals, so "it" the word doesn't count
+ACRONYM_MAX_LENGTH = 3
+
+
+def _keyword_alternation(keywords):
+    # Longest first, so "applied physics" is matched whole rather than as "physics"
+    return "|".join(r"\s+".join(map(re.escape, keyword.split()))
+                    for keyword in sorted(keywords, key=len, reverse=True))
+
+
+# Every keyword in one pattern, matched on word boundaries in a single pass over the text
+FIELD_PATTERN = re.compile(r"\b(?:(?i:{words})|{acronyms})\b".format(
+    words=_keyword_alternation(k for k in KEYWORD_FIELDS if len(k) > ACRONYM_MAX_LENGTH),
+    acronyms=_keyword_alternation(k.upper() for k in KEYWORD_FIELDS if len(k) <= ACRONYM_MAX_LENGTH)
+))
+# The fast tier stops reading pages once it has these; they decide eligibility and identify the candidate
+ELIGIBILITY_FIELDS = ("gate_score", "email", "name", "core_field")
+FAST_FIELDS = ELIGIBILITY_FIELDS + ("phone", "experience")
+# pyresparser key -> the field it fills
+NLP_FIELDS = {"name": "name", "email": "email", "mobile_number": "phone", "total_experience": "experience"}
+FIELD_DEFAULTS = {
+    "name": "Unknown",
+    "email": "unknown@example.com",
+    "phone": "Unknown",
+    "gate_score": 0,
+    "core_field": DEFAULT_CORE_FIELD,
+    "experience": 0,
+}
+
+
+class ExtractionStats:
+    """How often each extraction tier filled each field, and how long the tiers took."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.parses = 0
+        self.early_rejections = 0
+        self.nlp_runs = 0
+        self.pages_read = 0
+        self.pages_total = 0
+        self.fast_hits = dict.fromkeys(FAST_FIELDS, 0)
+        self.nlp_hits = dict.fromkeys(NLP_FIELDS.values(), 0)
+        self.seconds = {"fast": 0.0, "nlp": 0.0}
+        self.max_seconds = {"fast": 0.0, "nlp": 0.0}
+
+    def record(self, trace):
+        """Adds one parse_resume "extraction" trace."""
+        if not trace:
+            return
+        with self.lock:
+            self.parses += 1
+            self.early_rejections += trace["rejected_early"]
+            self.nlp_runs += trace["nlp_run"]
+            self.pages_read += trace["pages_read"]
+            self.pages_total += trace["pages_total"]
+            for field in trace["fast_fields"]:
+                self.fast_hits[field] += 1
+            for field in trace["nlp_fields"]:
+                self.nlp_hits[field] += 1
+            for tier in ("fast", "nlp"):
+                self.seconds[tier] += trace[f"{tier}_seconds"]
+                self.max_seconds[tier] = max(self.max_seconds[tier], trace[f"{tier}_seconds"])
+
+    def metrics(self):
+        with self.lock:
+            parses, nlp_runs = self.parses, self.nlp_runs
+            return {
+                "parses": parses,
+                "early_rejections": self.early_rejections,
+                "nlp_runs": nlp_runs,
+                "nlp_skipped": parses - nlp_runs,
+                "pages_read_ratio": round(self.pages_read / self.pages_total, 4) if self.pages_total else None,
+                "fast_hit_rate": {field: round(hits / parses, 4) if parses else None
+                                  for field, hits in self.fast_hits.items()},
+                "nlp_fill_rate": {field: round(hits / nlp_runs, 4) if nlp_runs else None
+                                  for field, hits in self.nlp_hits.items()},
+                "avg_fast_ms": round(self.seconds["fast"] / parses * 1000, 3) if parses else None,
+                "max_fast_ms": round(self.max_seconds["fast"] * 1000, 3),
+                "avg_nlp_ms": round(self.seconds["nlp"] / nlp_runs * 1000, 3) if nlp_runs else None,
+                "max_nlp_ms": round(self.max_seconds["nlp"] * 1000, 3),
+            }
+
+
 class ResumeParserService:
-    DB_PATH = r"C:\Users\Sudhindra Prakash\Desktop\java project\.venv\Backend\DRDO_Normalized_Updated_Names.db"
+    # Tier statistics of the resumes parsed, or reported (see ResumeJobService), in this process
+    extraction_stats = ExtractionStats()
+    # Cleared when the NLP models fail to load; parsing then uses the regex tiers alone
+    nlp_available = True
+
+    @staticmethod
+    def warm_models():
+        """Loads pyresparser's spaCy pipelines once and makes every later ResumeParser reuse them.
+
+        ResumeParser calls spacy.load for both of its models on each instantiation, so a
+        long-lived parsing process memoizes spacy.load and loads the two models up front.
+        """
+        import spacy
+        import pyresparser.resume_parser
+        if getattr(spacy.load, "memoized", False):
+            return
+        load, models = spacy.load, {}
+
+        def memoized_load(name, *args, **kwargs):
+            key = str(name)
+            if key not in models:
+                models[key] = load(name, *args, **kwargs)
+            return models[key]
+
+        memoized_load.memoized = True
+        spacy.load = memoized_load
+        spacy.load('en_core_web_sm')
+        spacy.load(os.path.dirname(os.path.abspath(pyresparser.resume_parser.__file__)))
+        print("✅ Resume parsing models loaded.")
 
     @staticmethod
     def extract_text_from_pdf(file_path):
@@ -28,9 +167,8 @@ class ResumeParserService:
     @staticmethod
     def extract_name(text):
         try:
-            # Pattern to match "Name: [some text]" or "Name: some text"
-            name_pattern = r'Name\s*:\s*(.+?)(?:\n|$)'
-            matches = re.findall(name_pattern, text, re.IGNORECASE)
+            # Matches "Name: [some text]" or "Name: some text"
+            matches = NAME_PATTERN.findall(text)
             if not matches:
                 print("⚠️ No name found in the text using regex.")
                 return "Unknown"
@@ -45,8 +183,7 @@ class ResumeParserService:
     @staticmethod
     def extract_email(text):
         try:
-            email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-            emails = re.findall(email_pattern, text)
+            emails = EMAIL_PATTERN.findall(text)
             return emails[0] if emails else "unknown@example.com"
         except Exception as e:
             print(f"❌ Error extracting email: {e}")
@@ -55,8 +192,7 @@ class ResumeParserService:
     @staticmethod
     def extract_phone(text):
         try:
-            phone_pattern = r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'
-            phones = re.findall(phone_pattern, text)
+            phones = PHONE_PATTERN.findall(text)
             return phones[0] if phones else "Unknown"
         except Exception as e:
             print(f"❌ Error extracting phone: {e}")
@@ -65,75 +201,140 @@ class ResumeParserService:
     @staticmethod
     def extract_gate_score(text):
         try:
-            gate_pattern = r'GATE\s+Score\s*(?:\n\s*)?Score\s*[:=]\s*(\d{3,4})'
-            matches = re.findall(gate_pattern, text, re.IGNORECASE)
+            matches = GATE_PATTERN.findall(text)
             print(f"GATE score matches: {matches}")
             return int(matches[0]) if matches else 0
         except Exception as e:
             print(f"❌ Error extracting GATE score: {e}")
             return 0
 
+    @staticmethod
+    def classify_core_field(text):
+        """{field: {"hits": keyword matches, "specificity": most words in a matched keyword}} in one scan of `text`."""
+        counts = {}
+        for match in FIELD_PATTERN.finditer(text):
+            field, specificity = KEYWORD_FIELDS[" ".join(match.group(0).lower().split())]
+            count = counts.setdefault(field, {"hits": 0, "specificity": 0})
+            count["hits"] += 1
+            count["specificity"] = max(count["specificity"], specificity)
+        return counts
+
     @staticmethod
     def extract_core_field(text):
+        """The field with the most keyword hits, then the most specific keyword; earlier fields win ties."""
         try:
-            fields = {
-                "Aerospace": ["aerospace", "aeronautical", "aviation", "avionics"],
-                "Computer Science": ["computer science", "cs", "cse", "information technology", "it"],
-                "Electronics": ["electronics", "ece", "eee", "electrical", "communication"],
-                "Mechanical": ["mechanical", "mech", "production engineering", "automobile"],
-                "Civil": ["civil engineering", "civil", "structural engineering"],
-                "Chemical": ["chemical", "chem", "petroleum", "petrochemical"],
-                "Biotechnology": ["biotechnology", "biotech", "biomedical", "biochemical"],
-                "Physics": ["physics", "applied physics"],
-                "Mathematics": ["mathematics", "math", "applied mathematics", "statistics"],
-                "Medical": ["medicine", "medical", "mbbs", "md", "surgery"]
-            }
-            text_lower = text.lower()
-            print(f"Text for core field extraction: {text_lower}")
-            matched_field = "General Engineering"
-            max_specificity = 0  # Track the longest matching keyword for specificity
-            for field, keywords in fields.items():
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        specificity = len(keyword.split())  # More words = more specific
-                        if specificity > max_specificity:
-                            max_specificity = specificity
-                            matched_field = field
-                            print(f"Matched core field: {field} with keyword: {keyword}")
-            return matched_field
+            counts = ResumeParserService.classify_core_field(text)
+            if not counts:
+                return DEFAULT_CORE_FIELD
+            return max(FIELD_KEYWORDS, key=lambda field: (
+                counts.get(field, {}).get("hits", 0), counts.get(field, {}).get("specificity", 0)))
         except Exception as e:
             print(f"❌ Error extracting core field: {e}")
-            return "General Engineering"
+            return DEFAULT_CORE_FIELD
+
+    @staticmethod
+    def iter_pdf_pages(file_path, trace):
+        """Yields the text of each page, extracting a page only when the next one is asked for."""
+        with pdfplumber.open(file_path) as pdf:
+            trace["pages_total"] = len(pdf.pages)
+            for page in pdf.pages:
+                trace["pages_read"] += 1
+                yield page.extract_text() or ""
 
     @staticmethod
-    def parse_resume(file_path):
+    def match_fields(text, fields):
+        """Fills the fast-tier fields missing from `fields` that the regexes find in `text`."""
+        if "gate_score" not in fields:
+            match = GATE_PATTERN.search(text)
+            if match:
+                fields["gate_score"] = int(match.group(1))
+        if "email" not in fields:
+            match = EMAIL_PATTERN.search(text)
+            if match:
+                fields["email"] = match.group(0)
+        if "name" not in fields:
+            match = NAME_PATTERN.search(text)
+            if match:
+                fields["name"] = match.group(1).strip().strip('[]')
+        if "phone" not in fields:
+            match = PHONE_PATTERN.search(text)
+            if match:
+                fields["phone"] = match.group(0)
+        if "experience" not in fields:
+            match = EXPERIENCE_PATTERN.search(text)
+            if match:
+                fields["experience"] = float(match.group(1) or match.group(2))
+        if "core_field" not in fields:
+            core_field = ResumeParserService.extract_core_field(text)
+            if core_field != DEFAULT_CORE_FIELD:
+                fields["core_field"] = core_field
+
+    @staticmethod
+    def read_until(pages, fields, text, needed):
+        """Reads further pages into `text`, matching as it goes, until every `needed` field is in `fields`."""
+        while not all(field in fields for field in needed):
+            page_text = next(pages, None)
+            if page_text is None:
+                break
+            text += page_text + "\n"
+            ResumeParserService.match_fields(text, fields)
+        return text
+
+    @staticmethod
+    def parse_resume(file_path, min_gate_score=None):
+        """Extracts the candidate's fields in tiers, cheapest first.
+
+        The fast tier runs the regexes page by page and stops reading once it has the fields
+        in ELIGIBILITY_FIELDS. With `min_gate_score` set, a candidate below it is returned at
+        that point, before any NLP. Otherwise the regexes go on through the remaining pages,
+        and pyresparser runs only for fields they still couldn't fill.
+        "extraction" in the result records what each tier did.
+        """
+        trace = {"pages_read": 0, "pages_total": 0, "fast_fields": [], "nlp_fields": [],
+                 "rejected_early": False, "nlp_run": False, "fast_seconds": 0.0, "nlp_seconds": 0.0}
+        pages = ResumeParserService.iter_pdf_pages(file_path, trace)
         try:
-            full_text = ResumeParserService.extract_text_from_pdf(file_path)
-            try:
-                parsed_data = ResumeParser(file_path).get_extracted_data()
-            except Exception as e:
-                print(f"⚠️ pyresparser failed: {e}, using fallback extraction")
-                parsed_data = {}
-
-            if not parsed_data.get("name"):
-                parsed_data["name"] = ResumeParserService.extract_name(full_text)
-            if not parsed_data.get("email"):
-                parsed_data["email"] = ResumeParserService.extract_email(full_text)
-            if not parsed_data.get("phone"):
-                parsed_data["phone"] = ResumeParserService.extract_phone(full_text)
-            gate_score = parsed_data.get("gate_score", 0)
-            if not gate_score:
-                gate_score = ResumeParserService.extract_gate_score(full_text)
-            parsed_data["gate_score"] = gate_score
-            if not parsed_data.get("core_field"):
-                parsed_data["core_field"] = ResumeParserService.extract_core_field(full_text)
-            if not parsed_data.get("experience"):
-                parsed_data["experience"] = parsed_data.get("total_experience", 0)
+            fields, parsed_data = {}, {}
+            started = time.perf_counter()
+            full_text = ResumeParserService.read_until(pages, fields, "", ELIGIBILITY_FIELDS)
+            trace["fast_seconds"] += time.perf_counter() - started
+
+            gate_score = fields.get("gate_score", 0)
+            if min_gate_score is not None and gate_score < min_gate_score:
+                trace["rejected_early"] = True
+                print(f"⚠️ GATE score {gate_score} is below {min_gate_score}, skipping NLP extraction")
+            else:
+                started = time.perf_counter()
+                full_text = ResumeParserService.read_until(pages, fields, full_text, FAST_FIELDS)
+                trace["fast_seconds"] += time.perf_counter() - started
+
+                if ResumeParserService.nlp_available and any(field not in fields for field in NLP_FIELDS.values()):
+                    trace["nlp_run"] = True
+                    started = time.perf_counter()
+                    try:
+                        parsed_data = ResumeParser(file_path).get_extracted_data() or {}
+                    except Exception as e:
+                        print(f"⚠️ pyresparser failed: {e}, using fallback extraction")
+                    trace["nlp_seconds"] = time.perf_counter() - started
+                    for key, field in NLP_FIELDS.items():
+                        if field not in fields and parsed_data.get(key):
+                            fields[field] = parsed_data[key]
+                            trace["nlp_fields"].append(field)
+
+            trace["fast_fields"] = [field for field in FAST_FIELDS
+                                    if field in fields and field not in trace["nlp_fields"]]
+            parsed_data.update(FIELD_DEFAULTS)
+            parsed_data.update(fields)
+            parsed_data.setdefault("total_experience", parsed_data["experience"])
             parsed_data["full_text"] = full_text
+            parsed_data["extraction"] = trace
+            ResumeParserService.extraction_stats.record(trace)
             return parsed_data
         except Exception as e:
             print(f"❌ Error parsing resume: {e}")
             return {}
+        finally:
+            pages.close()
 
     @staticmethod
     def store_resume_data(user_id, file_path, gate_score, parsed_data):
@@ -145,7 +346,7 @@ class ResumeParserService:
             experience = parsed_data.get("experience", 0)
             core_field = parsed_data.get("core_field", "Unknown")
 
-            with sqlite3.connect(ResumeParserService.DB_PATH, timeout=10) as conn:
+            with db.connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO Interviewee 
@@ -0,0 +1,87 @@
+import argparse
+import sys
+import db
+
+SLOT_INDEX = "idx_interview_schedule_slot"
+
+
+def ensure_schedule_columns(conn):
+    """Adds what interview_schedule needs without touching its rows: the email columns and the unique slot index.
+
+    The index, which makes the schedule inserts of SlotStore.book_slots idempotent, can
+    only be created once the table holds one booking per (Interviewer_ID, date, time). If
+    older writes left duplicates it is skipped with a warning until
+    `python schedule_migration.py` has removed them. Returns True if the index exists.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(interview_schedule)")}
+    for column in ("Interviewer_Email", "Interviewee_Email"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE interview_schedule ADD COLUMN {column} TEXT")
+    if has_slot_index(conn):
+        return True
+    duplicates = len(duplicate_bookings(conn))
+    if duplicates:
+        print(f"⚠️ interview_schedule has {duplicates} duplicate slot bookings; run schedule_migration.py "
+              f"to remove them and enable idempotent schedule writes.")
+        return False
+    create_slot_index(conn)
+    return True
+
+
+def has_slot_index(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (SLOT_INDEX,)).fetchone() is not None
+
+
+def create_slot_index(conn):
+    conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {SLOT_INDEX} ON interview_schedule(Interviewer_ID, date, time)")
+
+
+def duplicate_bookings(conn):
+    """(id, Interviewer_ID, Interviewee_ID, date, time, kept id) of every booking of a slot after its first."""
+    return conn.execute("""
+        SELECT s.id, s.Interviewer_ID, s.Interviewee_ID, s.date, s.time, first.id
+        FROM interview_schedule s
+        JOIN (
+            SELECT MIN(id) AS id, Interviewer_ID, date, time FROM interview_schedule
+            GROUP BY Interviewer_ID, date, time
+        ) first ON s.Interviewer_ID IS first.Interviewer_ID AND s.date IS first.date AND s.time IS first.time
+        WHERE s.id != first.id
+        ORDER BY s.id
+    """).fetchall()
+
+
+def remove_duplicate_bookings(conn, dry_run=False):
+    """One-off migration: deletes every booking of a slot after its first and creates the unique slot index.
+
+    Each dropped row is printed; returns them. With `dry_run` nothing is changed.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    duplicates = duplicate_bookings(conn)
+    for row_id, interviewer_id, interviewee_id, date, time, kept_id in duplicates:
+        print(f"⚠️ {'Would drop' if dry_run else 'Dropped'} booking {row_id}: {interviewee_id} with "
+              f"{interviewer_id} on {date} {time} (slot already booked by row {kept_id})")
+    if dry_run:
+        conn.rollback()
+        return duplicates
+    conn.executemany("DELETE FROM interview_schedule WHERE id = ?", [(row[0],) for row in duplicates])
+    create_slot_index(conn)
+    conn.commit()
+    print(f"✅ Removed {len(duplicates)} duplicate interview_schedule rows; unique slot index in place.")
+    return duplicates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Remove duplicate interview_schedule bookings and add the unique slot index.")
+    parser.add_argument("--db", help="SQLite database (default: DRDO_DB_PATH)")
+    parser.add_argument("--dry-run", action="store_true", help="list the rows that would be dropped, change nothing")
+    args = parser.parse_args(argv)
+    if args.db:
+        db.configure(args.db)
+    with db.connect() as conn:
+        remove_duplicate_bookings(conn, args.dry_run)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_MAX_BATCH = 50
+# How long the worker keeps collecting after the first candidate of a batch arrives
+DEFAULT_BATCH_WAIT = 0.05
+# Seconds between change_log polls while the queue is idle
+DEFAULT_POLL_INTERVAL = 5
+
+
+class SchedulingWorker:
+    """The single thread that scores, schedules and stores new candidates.
+
+    Signups only enqueue (candidate_id, core_field); the worker drains the bounded queue
+    in micro-batches, allocates each batch in one pass and commits it in one transaction,
+    so the scheduler's scores, slot calendar and pending schedule have exactly one writer.
+    Anything else that mutates the scheduler (e.g. a full recompute) must hold `lock`.
+    When idle, and at least every `poll_interval` seconds, the worker also applies
+    source-table edits from `change_consumer` (a ChangeLogConsumer) to the scores.
+    """
+
+    def __init__(self, scheduler, queue_size=DEFAULT_QUEUE_SIZE, max_batch=DEFAULT_MAX_BATCH,
+                 batch_wait=DEFAULT_BATCH_WAIT, change_consumer=None, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.scheduler = scheduler
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self.change_consumer = change_consumer
+        self.poll_interval = poll_interval
+        self._last_poll = time.monotonic()
+        # Called with the ids of candidates whose bookings were just committed
+        self.on_scheduled = None
+        # Called with the ids of candidates that could not be scheduled because of an error
+        self.on_failed = None
+        # Candidates booked by the last _process call, even if it then failed
+        self._booked = set()
+        self.lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self.submitted = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.max_batch_seen = 0
+        self.max_queue_depth = 0
+        self.last_commit_seconds = None
+        self.max_commit_seconds = 0.0
+        self.total_commit_seconds = 0.0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="scheduling-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, candidate_id, core_field, timeout=1):
+        """Queues a candidate; returns False if the queue stayed full for `timeout` seconds."""
+        try:
+            self._queue.put((candidate_id, core_field), timeout=timeout)
+        except queue.Full:
+            self.rejected += 1
+            print(f"⚠️ Scheduling queue full, {candidate_id} was not queued")
+            return False
+        self.submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.poll_interval if self.change_consumer else None)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if self.change_consumer and (not batch or time.monotonic() - self._last_poll >= self.poll_interval):
+                self._apply_changes()
+            if not batch:
+                continue
+            try:
+                with self.lock:
+                    self._process(batch)
+                self.processed += len(batch)
+            except Exception as e:
+                print(f"❌ Background scheduling failed for batch of {len(batch)}: {e}; retrying one by one")
+                remaining = [candidate for candidate in batch if candidate[0] not in self._booked]
+                self.processed += len(batch) - len(remaining)
+                self._process_singly(remaining)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _apply_changes(self):
+        self._last_poll = time.monotonic()
+        try:
+            with self.lock:
+                self.change_consumer.poll()
+        except Exception as e:
+            print(f"❌ Applying change_log entries failed: {e}")
+
+    def _process_singly(self, batch):
+        """Schedules a failed batch's candidates one at a time, so one bad candidate doesn't hold up the rest."""
+        failed = []
+        for candidate in batch:
+            try:
+                with self.lock:
+                    self._process([candidate])
+                self.processed += 1
+            except Exception as e:
+                failed.append(candidate[0])
+                print(f"❌ Background scheduling failed for {candidate[0]}: {e}")
+        self.failed += len(failed)
+        if failed and self.on_failed:
+            self.on_failed(failed)
+
+    def _process(self, batch):
+        self._booked = set()
+        self.scheduler.update_scores_for_candidates(batch)
+        first_booking = len(self.scheduler.schedule)
+        # Bookings are committed with their slot claims, so the commit time includes the allocation
+        started = time.perf_counter()
+        try:
+            self.scheduler.schedule_candidates([candidate_id for candidate_id, _ in batch])
+        finally:
+            # Bookings still in the schedule were committed, even if a later candidate failed
+            booked = [entry["Interviewee_ID"] for entry in self.scheduler.schedule[first_booking:]]
+            self._booked.update(booked)
+            self.scheduler.store_schedule_in_db()
+            if self.on_scheduled and booked:
+                self.on_scheduled(booked)
+        commit_seconds = time.perf_counter() - started
+
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        self.last_commit_seconds = commit_seconds
+        self.max_commit_seconds = max(self.max_commit_seconds, commit_seconds)
+        self.total_commit_seconds += commit_seconds
+        print(f"✅ Background scheduling completed for {len(batch)} candidates (commit {commit_seconds * 1000:.1f} ms)")
+
+    def join(self):
+        """Blocks until every queued candidate has been processed."""
+        self._queue.join()
+
+    def metrics(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_seen,
+            "avg_batch_size": round(self.processed / self.batches, 2) if self.batches else None,
+            "last_commit_ms": None if self.last_commit_seconds is None else round(self.last_commit_seconds * 1000, 3),
+            "max_commit_ms": round(self.max_commit_seconds * 1000, 3),
+            "avg_commit_ms": round(self.total_commit_seconds / self.batches * 1000, 3) if self.batches else None,
+            "change_log": self.change_consumer.metrics() if self.change_consumer else None,
+        }
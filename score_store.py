@@ -0,0 +1,207 @@
+import json
+import os
+import numpy as np
+
+SNAPSHOT_DIR = "score_snapshot"
+SNAPSHOT_VERSION = 1
+
+def best_pairs(distinct_scores, inverse, interviewee_ids, interviewer_ids, pairs=None):
+    """Adds each interviewee's best interviewer to `pairs` as {(interviewee_id, interviewer_id): score}.
+
+    Row inverse[i] of distinct_scores holds interviewee i's scores; the argmax is taken
+    once per distinct row and broadcast. Ties go to the first interviewer, and
+    interviewees whose best score is 0 are left out.
+    """
+    pairs = {} if pairs is None else pairs
+    if not len(interviewee_ids):
+        return pairs
+    distinct_best = distinct_scores.argmax(axis=1)
+    distinct_best_scores = distinct_scores[np.arange(len(distinct_scores)), distinct_best]
+    best, best_scores = distinct_best[inverse], distinct_best_scores[inverse]
+    for i in np.flatnonzero(best_scores > 0):
+        best_interviewer = interviewer_ids[best[i]]
+        if best_interviewer:
+            pairs[(interviewee_ids[i], best_interviewer)] = best_scores[i]
+    return pairs
+
+
+class ScoreStore:
+    """Interviewee × interviewer scores held in a float32 matrix with interned id → index maps.
+
+    Supports the dict-style `get`/`[]` access the dashboards use, whole-row and
+    whole-column reads, and in-place row writes for newly signed-up candidates.
+    Missing pairs read as 0, exactly like the score dicts this replaces.
+    """
+
+    def __init__(self, row_ids=(), column_ids=()):
+        self.row_index = {}
+        self.column_index = {}
+        for row_id in row_ids:
+            self.row_index.setdefault(row_id, len(self.row_index))
+        for column_id in column_ids:
+            self.column_index.setdefault(column_id, len(self.column_index))
+        self._values = np.zeros((max(len(self.row_index), 1), max(len(self.column_index), 1)), dtype=np.float32)
+
+    @classmethod
+    def from_pairs(cls, pairs, column_ids=()):
+        """Builds a store from a {(row_id, column_id): score} mapping."""
+        store = cls(dict.fromkeys(row_id for row_id, _ in pairs), column_ids)
+        for pair, score in pairs.items():
+            store[pair] = score
+        return store
+
+    @classmethod
+    def from_array(cls, values, row_ids, column_ids):
+        """Wraps an existing (rows × columns) float32 array, e.g. a memory-mapped snapshot, without copying."""
+        store = cls()
+        store.row_index = {row_id: row for row, row_id in enumerate(row_ids)}
+        store.column_index = {column_id: column for column, column_id in enumerate(column_ids)}
+        store._values = values
+        return store
+
+    @property
+    def values(self):
+        """View of the live (rows × columns) score matrix."""
+        return self._values[:len(self.row_index), :len(self.column_index)]
+
+    def _row(self, row_id, create=False):
+        row = self.row_index.get(row_id)
+        if row is None and create:
+            row = len(self.row_index)
+            if row >= self._values.shape[0]:
+                # Double the capacity so appending candidates one at a time stays amortized O(1)
+                grown = np.zeros((max(self._values.shape[0] * 2, 1), self._values.shape[1]), dtype=np.float32)
+                grown[:row] = self._values[:row]
+                self._values = grown
+            self.row_index[row_id] = row
+        return row
+
+    def _column(self, column_id, create=False):
+        column = self.column_index.get(column_id)
+        if column is None and create:
+            column = len(self.column_index)
+            if column >= self._values.shape[1]:
+                grown = np.zeros((self._values.shape[0], max(self._values.shape[1] * 2, 1)), dtype=np.float32)
+                grown[:, :column] = self._values[:, :column]
+                self._values = grown
+            self.column_index[column_id] = column
+        return column
+
+    def get(self, pair, default=0):
+        row_id, column_id = pair
+        row = self.row_index.get(row_id)
+        column = self.column_index.get(column_id)
+        if row is None or column is None:
+            return default
+        return float(self._values[row, column])
+
+    def __getitem__(self, pair):
+        return self.get(pair)
+
+    def __setitem__(self, pair, score):
+        row_id, column_id = pair
+        column = self._column(column_id, create=True)
+        row = self._row(row_id, create=True)
+        self._values[row, column] = score
+
+    def __contains__(self, pair):
+        return self.get(pair) != 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.values))
+
+    def row(self, row_id):
+        """Scores of one row in column_index order, or None if the id is unknown."""
+        row = self.row_index.get(row_id)
+        return None if row is None else self._values[row, :len(self.column_index)]
+
+    def column(self, column_id):
+        """Scores of one column in row_index order, or None if the id is unknown."""
+        column = self.column_index.get(column_id)
+        return None if column is None else self._values[:len(self.row_index), column]
+
+    def set_row(self, row_id, scores):
+        """Overwrites a whole row in place; `scores` is in column_index order."""
+        row = self._row(row_id, create=True)
+        self._values[row, :len(self.column_index)] = scores
+
+    def column_positions(self, column_ids):
+        """Column index of each id as an int array, adding columns for unseen ids."""
+        return np.array([self._column(column_id, create=True) for column_id in column_ids], dtype=np.int64)
+
+    def update_row(self, row_id, columns, scores):
+        """Writes `scores` into one row at the given column positions, leaving the other cells untouched."""
+        row = self._row(row_id, create=True)
+        self._values[row, columns] = scores
+
+    def update_column(self, column_id, row_ids, scores):
+        """Writes `scores` into one column for the given row ids, adding rows for unseen ids."""
+        column = self._column(column_id, create=True)
+        rows = np.array([self._row(row_id, create=True) for row_id in row_ids], dtype=np.int64)
+        self._values[rows, column] = scores
+
+    def items(self):
+        """Yields ((row_id, column_id), score) for every non-zero pair."""
+        row_ids = list(self.row_index)
+        column_ids = list(self.column_index)
+        values = self.values
+        for row, column in zip(*np.nonzero(values)):
+            yield (row_ids[row], column_ids[column]), float(values[row, column])
+
+    def keys(self):
+        return (pair for pair, _ in self.items())
+
+    @property
+    def nbytes(self):
+        return self._values.nbytes
+
+
+class ScoreSnapshot:
+    """On-disk copy of named ScoreStores, valid only for the source-table fingerprint it was built from.
+
+    Each store is written as `<name>.npy`; `manifest.json` records the fingerprint and
+    the row/column ids. Loading memory-maps the arrays copy-on-write, so later in-place
+    updates stay in the process and never touch the files.
+    """
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+
+    def load(self, fingerprint):
+        """Returns {name: ScoreStore} if a snapshot for `fingerprint` exists, else None."""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != SNAPSHOT_VERSION or manifest.get("fingerprint") != fingerprint:
+                return None
+            stores = {}
+            for name, ids in manifest["stores"].items():
+                values = np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode="c")
+                if values.shape != (len(ids["rows"]), len(ids["columns"])):
+                    return None
+                stores[name] = ScoreStore.from_array(values, ids["rows"], ids["columns"])
+            return stores
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable score snapshot: {e}")
+            return None
+
+    def save(self, fingerprint, stores):
+        """Writes every store, then the manifest, so a crash never leaves a manifest pointing at partial files."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            manifest = {"version": SNAPSHOT_VERSION, "fingerprint": fingerprint, "stores": {}}
+            for name, store in stores.items():
+                tmp_path = os.path.join(self.directory, f"{name}.tmp.npy")
+                np.save(tmp_path, np.ascontiguousarray(store.values))
+                os.replace(tmp_path, os.path.join(self.directory, f"{name}.npy"))
+                manifest["stores"][name] = {"rows": list(store.row_index), "columns": list(store.column_index)}
+            tmp_manifest = self.manifest_path + ".tmp"
+            with open(tmp_manifest, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_manifest, self.manifest_path)
+            print(f"✅ Score snapshot written to {self.directory}")
+        except Exception as e:
+            print(f"❌ Error writing score snapshot: {e}")
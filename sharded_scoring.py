@@ -0,0 +1,155 @@
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import db
+from dataload import DataLoader
+from cossimilarity import JaccardScores, SimilarityCalculator
+from matching import MatchingService
+from score_store import best_pairs
+from skill_index import SkillIndex
+
+DEFAULT_SHARD_SIZE = 50000
+
+# Interviewer-side state of the current scoring run, set once per worker process by _init_worker
+_worker_state = {}
+
+
+class ShardResult:
+    """Scores of one id-range shard: distinct score rows plus each interviewee's row in them."""
+    __slots__ = ("index", "first_id", "last_id", "interviewee_ids", "distinct_scores", "inverse",
+                 "distinct_sets", "seconds")
+
+    def __init__(self, index, first_id, last_id, interviewee_ids, distinct_scores, inverse, distinct_sets, seconds):
+        self.index = index
+        self.first_id = first_id
+        self.last_id = last_id
+        self.interviewee_ids = interviewee_ids
+        self.distinct_scores = distinct_scores
+        self.inverse = inverse
+        self.distinct_sets = distinct_sets
+        self.seconds = seconds
+
+
+def _init_worker(db_path, kind, interviewer_state):
+    db.configure(db_path)
+    _worker_state.clear()
+    _worker_state.update(kind=kind, interviewers=interviewer_state)
+
+
+def _score_shard(index, first_id, last_id):
+    started = time.perf_counter()
+    kind, interviewers = _worker_state["kind"], _worker_state["interviewers"]
+    rows = list(DataLoader.get_interviewees((first_id, last_id)))
+    distinct_sets = None
+    if kind == "similarity":
+        vectorizer, interviewer_tfidf = interviewers
+        distinct_scores, inverse, interviewee_ids = SimilarityCalculator.score_interviewees(
+            vectorizer, interviewer_tfidf, rows
+        )
+    elif kind == "jaccard":
+        distinct_sets, distinct_scores, inverse, interviewee_ids = SimilarityCalculator.jaccard_interviewees(
+            interviewers, rows
+        )
+    else:
+        interviewer_ids, interviewer_fields, interviewer_skills = interviewers
+        skill_index = SkillIndex({**interviewer_skills, **DataLoader.load_skill_map(id_range=(first_id, last_id))})
+        distinct_scores, inverse, interviewee_ids = MatchingService.score_interviewees(
+            interviewer_ids, interviewer_fields, skill_index, rows
+        )
+    return ShardResult(index, first_id, last_id, interviewee_ids, distinct_scores, inverse, distinct_sets,
+                       time.perf_counter() - started)
+
+
+class ShardedScorer:
+    """Scores interviewees in id-range shards against one shared, read-only interviewer side.
+
+    Each shard reads its own rows and skills from the database and returns only its
+    distinct score rows, so peak memory follows `shard_size`, not the population. With
+    workers > 1 the shards run on a process pool that receives the interviewer side once
+    per worker; at most two shards per worker are in flight at a time. `progress` is
+    called with each ShardResult as it completes, in shard order.
+    """
+
+    def __init__(self, shard_size=DEFAULT_SHARD_SIZE, workers=1, progress=None):
+        self.shard_size = shard_size
+        self.workers = workers
+        self.progress = progress
+        self.interviewer_ids = []
+
+    def _interviewer_state(self, kind):
+        interviewers_df = DataLoader.load_interviewers()
+        if interviewers_df.empty:
+            print(f"❌ No interviewer data for sharded {kind} scoring.")
+            return None
+        self.interviewer_ids = interviewers_df["interviewer_id"].tolist()
+        if kind == "similarity":
+            return SimilarityCalculator.fit_interviewers(interviewers_df)
+        if kind == "jaccard":
+            return SimilarityCalculator.tokenize_interviewers(interviewers_df)
+        interviewer_ids, interviewer_fields = MatchingService.prepare_interviewers(interviewers_df)
+        return interviewer_ids, interviewer_fields, DataLoader.load_skill_map(user_ids=set(interviewer_ids))
+
+    def iter_shards(self, kind):
+        """Yields a ShardResult per shard for kind "similarity", "jaccard" or "matching"."""
+        interviewer_state = self._interviewer_state(kind)
+        if interviewer_state is None:
+            return
+        ranges = enumerate(DataLoader.iter_interviewee_id_ranges(self.shard_size))
+
+        if self.workers <= 1:
+            _init_worker(db.DB_PATH, kind, interviewer_state)
+            for index, (first_id, last_id, _) in ranges:
+                yield self._report(_score_shard(index, first_id, last_id))
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(db.DB_PATH, kind, interviewer_state)) as pool:
+            pending = deque()
+            for index, (first_id, last_id, _) in ranges:
+                pending.append(pool.submit(_score_shard, index, first_id, last_id))
+                if len(pending) >= 2 * self.workers:
+                    yield self._report(pending.popleft().result())
+            while pending:
+                yield self._report(pending.popleft().result())
+
+    def _report(self, result):
+        print(f"✅ Scored shard {result.index} ({result.first_id}..{result.last_id}): "
+              f"{len(result.inverse)} rows, {len(result.distinct_scores)} distinct, in {result.seconds:.2f}s")
+        if self.progress:
+            self.progress(result)
+        return result
+
+    def similarity(self):
+        pairs = {}
+        for result in self.iter_shards("similarity"):
+            SimilarityCalculator.signature_stats.record_batch(len(result.inverse), len(result.distinct_scores))
+            best_pairs(result.distinct_scores, result.inverse, result.interviewee_ids, self.interviewer_ids, pairs)
+        return pairs
+
+    def matching(self):
+        pairs = {}
+        for result in self.iter_shards("matching"):
+            MatchingService.signature_stats.record_batch(len(result.inverse), len(result.distinct_scores))
+            best_pairs(result.distinct_scores, result.inverse, result.interviewee_ids, self.interviewer_ids, pairs)
+        return pairs
+
+    def jaccard(self):
+        # Token sets repeat across shards, so shard rows are folded into one global distinct row per set
+        row_by_set, distinct_rows, interviewee_rows = {}, [], {}
+        for result in self.iter_shards("jaccard"):
+            SimilarityCalculator.signature_stats.record_batch(len(result.inverse), len(result.distinct_scores))
+            shard_rows = []
+            for local_row, tokens in enumerate(result.distinct_sets):
+                if tokens not in row_by_set:
+                    row_by_set[tokens] = len(distinct_rows)
+                    distinct_rows.append(result.distinct_scores[local_row])
+                shard_rows.append(row_by_set[tokens])
+            shard_rows = np.array(shard_rows, dtype=np.int64)
+            for interviewee_id, row in zip(result.interviewee_ids, shard_rows[result.inverse]):
+                interviewee_rows[interviewee_id] = int(row)
+
+        distinct_scores = (np.vstack(distinct_rows) if distinct_rows
+                           else np.zeros((0, len(self.interviewer_ids)), dtype=np.float32))
+        interviewer_index = {interviewer_id: j for j, interviewer_id in enumerate(self.interviewer_ids)}
+        return JaccardScores(distinct_scores, interviewee_rows, interviewer_index)
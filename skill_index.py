@@ -0,0 +1,72 @@
+import numpy as np
+from scipy import sparse
+from dataload import DataLoader
+
+class SkillIndex:
+    """Bulk-loaded user skills, integer-coded so overlaps can be computed as sparse products."""
+
+    def __init__(self, skills_by_user):
+        self.skills_by_user = skills_by_user
+        self.skill_codes = {}
+        for skills in skills_by_user.values():
+            for skill in skills:
+                self.skill_codes.setdefault(skill, len(self.skill_codes))
+
+    @classmethod
+    def load(cls):
+        return cls(DataLoader.load_skill_map())
+
+    def get(self, user_id):
+        """Same set DataLoader.get_skills_for_user returns, without touching the database."""
+        return self.skills_by_user.get(user_id, frozenset())
+
+    def incidence_matrix(self, user_ids):
+        """Binary CSR matrix with one row per user id and one column per skill code."""
+        return self.incidence_from_sets([self.get(user_id) for user_id in user_ids])
+
+    def incidence_from_sets(self, skill_sets):
+        """Binary CSR matrix with one row per skill set; unknown skills are ignored."""
+        return incidence_matrix(skill_sets, self.skill_codes)
+
+
+def incidence_matrix(value_sets, codes):
+    """Binary CSR matrix with one row per set and one column per code; values missing from `codes` are ignored."""
+    indptr, indices = [0], []
+    for values in value_sets:
+        indices.extend(codes[value] for value in values if value in codes)
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(value_sets), len(codes)))
+
+
+def code_values(values, codes=None):
+    """Maps each value to a small integer code, extending `codes` with unseen values."""
+    codes = {} if codes is None else codes
+    return np.array([codes.setdefault(value, len(codes)) for value in values], dtype=np.int64), codes
+
+
+class SignatureCache:
+    """Memoizes score rows by normalized field/skill signature and counts cache hits."""
+
+    def __init__(self):
+        self.rows = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, signature, compute):
+        if signature in self.rows:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.rows[signature] = compute()
+        return self.rows[signature]
+
+    def record_batch(self, total, distinct):
+        """Counts a batch of `total` rows that collapsed to `distinct` signatures."""
+        self.hits += total - distinct
+        self.misses += distinct
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,226 @@
+import copy
+from datetime import date, timedelta
+import numpy as np
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(hh_mm):
+    hours, minutes = hh_mm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def to_hh_mm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class DriveWindow:
+    """Dates and daily working pattern of an interview drive.
+
+    Each day runs from `day_start` to `day_end` in `slot_minutes` slots, jumps over the
+    lunch break, and adds a `break_minutes` pause before every `break_every`-th slot.
+    """
+
+    def __init__(self, start_date="2025-05-01", end_date="2025-05-05", day_start="10:00", day_end="17:00",
+                 lunch_start="13:00", lunch_minutes=30, slot_minutes=30, break_every=3, break_minutes=2):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.day_start = to_minutes(day_start)
+        self.day_end = to_minutes(day_end)
+        self.lunch_start = to_minutes(lunch_start)
+        self.lunch_end = self.lunch_start + lunch_minutes
+        self.slot_minutes = slot_minutes
+        self.break_every = break_every
+        self.break_minutes = break_minutes
+
+    def days(self):
+        first, last = date.fromisoformat(self.start_date), date.fromisoformat(self.end_date)
+        return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+    def day_template(self):
+        """(starts, ends) minute arrays of one day's slots, computed with array arithmetic per segment."""
+        starts, done = self._segment(self.day_start, 0)
+        if done is not None:
+            # The morning ran into lunch: resume after it, keeping the slot count for the breaks
+            afternoon, _ = self._segment(self.lunch_end, done)
+            starts = np.concatenate([starts, afternoon])
+        return starts, starts + self.slot_minutes
+
+    def _segment(self, t0, k0):
+        """Slots from `t0` with `k0` slots already done; returns (starts, slots done) if lunch cut it short."""
+        n = max((self.day_end - t0) // self.slot_minutes + 1, 0)
+        k = k0 + np.arange(n, dtype=np.int32)
+
+        def breaks(upto):
+            # Breaks taken before slots 1..upto; none when break_every is 0
+            if not self.break_every:
+                return np.zeros_like(upto)
+            return np.maximum(upto, 0) // self.break_every
+
+        offset = t0 + (k - k0) * self.slot_minutes - self.break_minutes * breaks(np.int32(k0 - 1))
+        # The end/lunch checks look at the time before this slot's own break is added
+        before_break = offset + self.break_minutes * breaks(k - 1)
+        starts = offset + self.break_minutes * breaks(k)
+        in_lunch = (self.lunch_start <= before_break) & (before_break < self.lunch_end)
+        past_end = before_break + self.slot_minutes > self.day_end
+        stops = np.flatnonzero(in_lunch | past_end)
+        if not stops.size:
+            return starts, None
+        stop = int(stops[0])
+        return starts[:stop], (k0 + stop if in_lunch[stop] and not past_end[stop] else None)
+
+
+class SlotCalendar:
+    """Free/taken bitmap over a slot grid shared by every interviewer.
+
+    All interviewers follow the same days and daily template, so the grid is stored
+    once as integer-minute arrays and each interviewer only owns one row of a boolean
+    `free` matrix. An earliest-free pointer per interviewer makes taking the earliest
+    slot amortized O(1), releases are O(1), and "next free slot at or after T" is a
+    binary search plus a vectorized scan of one row.
+    """
+
+    def __init__(self, interviewer_ids, days, template_starts, template_ends):
+        self.days = list(days)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        template_starts = np.asarray(template_starts, dtype=np.int32)
+        template_ends = np.asarray(template_ends, dtype=np.int32)
+        self.slots_per_day = len(template_starts)
+        day_offsets = np.arange(len(self.days), dtype=np.int32)[:, None] * MINUTES_PER_DAY
+        # slot_keys are absolute minutes since the first day, so they sort by (date, start time)
+        self.slot_keys = (day_offsets + template_starts[None, :]).ravel()
+        self.slot_starts = np.tile(template_starts, len(self.days))
+        self.slot_ends = np.tile(template_ends, len(self.days))
+        self.interviewer_index = {interviewer_id: i for i, interviewer_id in enumerate(interviewer_ids)}
+        self.free = np.ones((len(self.interviewer_index), len(self.slot_keys)), dtype=bool)
+        self.next_free = np.zeros(len(self.interviewer_index), dtype=np.int64)
+        self.free_count = np.full(len(self.interviewer_index), len(self.slot_keys), dtype=np.int64)
+
+    def subset(self, interviewer_ids):
+        """Independent calendar for some interviewers, e.g. to hand one partition to a worker process."""
+        rows = [self.interviewer_index[interviewer_id] for interviewer_id in interviewer_ids]
+        sub = copy.copy(self)
+        sub.interviewer_index = {interviewer_id: i for i, interviewer_id in enumerate(interviewer_ids)}
+        sub.free = self.free[rows].copy()
+        sub.next_free = self.next_free[rows].copy()
+        sub.free_count = self.free_count[rows].copy()
+        return sub
+
+    def _slot(self, date, start_time):
+        """Grid index of the slot starting at `date` `start_time`, or None if there is no such slot."""
+        day = self.day_index.get(date)
+        if day is None:
+            return None
+        key = day * MINUTES_PER_DAY + to_minutes(start_time)
+        slot = int(np.searchsorted(self.slot_keys, key))
+        if slot < len(self.slot_keys) and self.slot_keys[slot] == key:
+            return slot
+        return None
+
+    def _describe(self, slot):
+        return {
+            "Date": self.days[slot // self.slots_per_day],
+            "Start_Time": to_hh_mm(int(self.slot_starts[slot])),
+            "End_Time": to_hh_mm(int(self.slot_ends[slot])),
+        }
+
+    def _first_free(self, interviewer, start):
+        row = self.free[interviewer, start:]
+        if not row.size:
+            return None
+        offset = int(np.argmax(row))
+        return start + offset if row[offset] else None
+
+    def _take(self, interviewer, slot):
+        self.free[interviewer, slot] = False
+        self.free_count[interviewer] -= 1
+        if slot == self.next_free[interviewer]:
+            following = self._first_free(interviewer, slot + 1)
+            self.next_free[interviewer] = len(self.slot_keys) if following is None else following
+
+    def mark_taken_many(self, interviewer_ids, dates, start_times):
+        """Vectorized mark_taken over parallel sequences; unknown interviewers, days or times are skipped."""
+        rows = np.array([self.interviewer_index.get(i, -1) for i in interviewer_ids], dtype=np.int64)
+        days = np.array([self.day_index.get(d, -1) for d in dates], dtype=np.int64)
+        minutes = np.array([to_minutes(t) for t in start_times], dtype=np.int64)
+        keys = days * MINUTES_PER_DAY + minutes
+        slots = np.minimum(np.searchsorted(self.slot_keys, keys), len(self.slot_keys) - 1)
+        valid = (rows >= 0) & (days >= 0) & (self.slot_keys[slots] == keys)
+        self.free[rows[valid], slots[valid]] = False
+        self.free_count = self.free.sum(axis=1)
+        has_free = self.free.any(axis=1)
+        self.next_free = np.where(has_free, self.free.argmax(axis=1), len(self.slot_keys))
+
+    def reset(self, interviewer_ids):
+        """Marks every slot of the given interviewers free, e.g. before re-reading their bookings."""
+        rows = [self.interviewer_index[i] for i in interviewer_ids if i in self.interviewer_index]
+        self.free[rows] = True
+        self.free_count[rows] = len(self.slot_keys)
+        self.next_free[rows] = 0
+
+    def mark_taken(self, interviewer_id, date, start_time):
+        """Marks an already-booked slot as taken; unknown interviewers or slots are ignored."""
+        interviewer = self.interviewer_index.get(interviewer_id)
+        slot = None if interviewer is None else self._slot(date, start_time)
+        if slot is not None and self.free[interviewer, slot]:
+            self._take(interviewer, slot)
+
+    def next_free_slot(self, interviewer_id, date=None, start_time=None):
+        """Earliest free slot at or after `date` `start_time` (or overall), without claiming it."""
+        interviewer = self.interviewer_index.get(interviewer_id)
+        if interviewer is None:
+            return None
+        slot = self._find(interviewer, date, start_time)
+        return None if slot is None else self._describe(slot)
+
+    def _find(self, interviewer, date, start_time):
+        if date is None:
+            slot = int(self.next_free[interviewer])
+            return slot if slot < len(self.slot_keys) else None
+        day = self.day_index.get(date)
+        if day is None:
+            return None
+        key = day * MINUTES_PER_DAY + to_minutes(start_time or "00:00")
+        start = max(int(np.searchsorted(self.slot_keys, key)), int(self.next_free[interviewer]))
+        return self._first_free(interviewer, start)
+
+    def claim(self, interviewer_id, date=None, start_time=None):
+        """Takes the earliest free slot (at or after `date` `start_time` if given); returns it or None."""
+        interviewer = self.interviewer_index.get(interviewer_id)
+        if interviewer is None:
+            return None
+        slot = self._find(interviewer, date, start_time)
+        if slot is None:
+            return None
+        self._take(interviewer, slot)
+        return self._describe(slot)
+
+    def release(self, interviewer_id, date, start_time):
+        """Frees a previously claimed slot, e.g. after a cancellation. Returns True if it was taken."""
+        interviewer = self.interviewer_index.get(interviewer_id)
+        slot = None if interviewer is None else self._slot(date, start_time)
+        if slot is None or self.free[interviewer, slot]:
+            return False
+        self.free[interviewer, slot] = True
+        self.free_count[interviewer] += 1
+        self.next_free[interviewer] = min(int(self.next_free[interviewer]), slot)
+        return True
+
+    def free_slots(self, interviewer_id):
+        interviewer = self.interviewer_index.get(interviewer_id)
+        return 0 if interviewer is None else int(self.free_count[interviewer])
+
+    def free_by_interviewer(self):
+        return {interviewer_id: int(self.free_count[i]) for interviewer_id, i in self.interviewer_index.items()}
+
+    def free_for_field(self, registry, field):
+        """Free slots left across the distinct interviewers of one (lowercased) field."""
+        interviewer_ids = dict.fromkeys(registry.ids[row] for row in registry.rows_for_field(field))
+        return sum(self.free_slots(interviewer_id) for interviewer_id in interviewer_ids)
+
+    def total_free(self):
+        return int(self.free_count.sum())
+
+    @property
+    def nbytes(self):
+        return self.free.nbytes + self.slot_keys.nbytes + self.slot_starts.nbytes + self.slot_ends.nbytes
@@ -0,0 +1,143 @@
+import db
+from slot_calendar import to_hh_mm
+
+# Interviewer ids per IN (...) filter, well under SQLite's bound-parameter limit
+ID_CHUNK = 500
+
+
+class SlotStore:
+    """Interview slots materialized in the `interview_slots` table, shared by every process.
+
+    Each (interviewer, date, start time) is one row under a unique constraint. A claim is a
+    conditional `UPDATE ... WHERE status = 'free'`, so when several app workers pick the
+    same slot exactly one of them sees its update applied and the others move on. The
+    booking's interview_schedule row is inserted in the same transaction, so a booked slot
+    always has one. The in-process SlotCalendar stays as a fast, optimistic view; this
+    table is the authority.
+    """
+
+    def ensure_schema(self):
+        with db.connect() as conn:
+            self._ensure_schema(conn)
+
+    def materialize(self, interviewer_ids, window):
+        """Adds any missing slots of the drive window and syncs their status with interview_schedule.
+
+        Slots with a schedule row are marked booked; booked slots without one, e.g. left by a
+        claim that was never stored or by a deleted booking, are freed.
+        """
+        template_starts, template_ends = window.day_template()
+        day_slots = [(to_hh_mm(int(start)), to_hh_mm(int(end))) for start, end in zip(template_starts, template_ends)]
+        rows = (
+            (interviewer_id, day, start, end)
+            for interviewer_id in interviewer_ids
+            for day in window.days()
+            for start, end in day_slots
+        )
+        with db.connect() as conn:
+            self._ensure_schema(conn)
+            conn.executemany("""
+                INSERT OR IGNORE INTO interview_slots (Interviewer_ID, date, start_time, end_time)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            conn.execute("""
+                UPDATE interview_slots
+                SET status = 'booked',
+                    Interviewee_ID = (
+                        SELECT s.Interviewee_ID FROM interview_schedule s
+                        WHERE s.Interviewer_ID = interview_slots.Interviewer_ID
+                          AND s.date = interview_slots.date
+                          AND substr(s.time, 1, 5) = interview_slots.start_time
+                    )
+                WHERE status = 'free' AND EXISTS (
+                    SELECT 1 FROM interview_schedule s
+                    WHERE s.Interviewer_ID = interview_slots.Interviewer_ID
+                      AND s.date = interview_slots.date
+                      AND substr(s.time, 1, 5) = interview_slots.start_time
+                )
+            """)
+            freed = conn.execute("""
+                UPDATE interview_slots SET status = 'free', Interviewee_ID = NULL
+                WHERE status != 'free' AND NOT EXISTS (
+                    SELECT 1 FROM interview_schedule s
+                    WHERE s.Interviewer_ID = interview_slots.Interviewer_ID
+                      AND s.date = interview_slots.date
+                      AND substr(s.time, 1, 5) = interview_slots.start_time
+                )
+            """).rowcount
+        if freed:
+            print(f"⚠️ Freed {freed} booked slots that had no interview_schedule row")
+
+    def _ensure_schema(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS interview_slots (
+                id INTEGER PRIMARY KEY,
+                Interviewer_ID TEXT NOT NULL,
+                date TEXT NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'free',
+                Interviewee_ID TEXT,
+                UNIQUE (Interviewer_ID, date, start_time)
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_interview_slots_free
+            ON interview_slots(Interviewer_ID, status, date, start_time)
+        """)
+
+    def taken_slots(self, interviewer_ids, start_date, end_date):
+        """(interviewer_id, date, start_time) of the given interviewers' slots in the date range that are no longer free.
+
+        Interviewer_ID is a TEXT column, so an INTEGER interviewer id is read back as a
+        string ('7' for 7); each row is mapped back to the matching id of `interviewer_ids`.
+        """
+        ids_by_key = {str(interviewer_id): interviewer_id for interviewer_id in interviewer_ids}
+        keys = list(ids_by_key)
+        taken = []
+        with db.connect() as conn:
+            for start in range(0, len(keys), ID_CHUNK):
+                chunk = keys[start:start + ID_CHUNK]
+                rows = conn.execute(f"""
+                    SELECT Interviewer_ID, date, start_time FROM interview_slots
+                    WHERE status != 'free' AND date BETWEEN ? AND ?
+                      AND Interviewer_ID IN ({",".join("?" * len(chunk))})
+                """, [start_date, end_date] + chunk)
+                taken.extend((ids_by_key[str(interviewer_id)], date, start_time)
+                             for interviewer_id, date, start_time in rows)
+        return taken
+
+    def book_slots(self, bookings):
+        """Claims each booking's slot and inserts its interview_schedule row, in one transaction.
+
+        `bookings` are (interviewer_id, date, start_time, end_time, interviewee_id,
+        interviewer_email, interviewee_email). Returns one flag per booking: True if this
+        call booked the slot, False if another process had already taken it (or it is not
+        in the table).
+        """
+        results = []
+        with db.connect() as conn:
+            for interviewer_id, date, start_time, end_time, interviewee_id, interviewer_email, interviewee_email in bookings:
+                cursor = conn.execute("""
+                    UPDATE interview_slots SET status = 'booked', Interviewee_ID = ?
+                    WHERE Interviewer_ID = ? AND date = ? AND start_time = ? AND status = 'free'
+                """, (interviewee_id, interviewer_id, date, start_time))
+                claimed = cursor.rowcount == 1
+                if claimed:
+                    conn.execute("""
+                        INSERT OR IGNORE INTO interview_schedule
+                            (date, time, Interviewee_ID, Interviewer_ID, Interviewer_Email, Interviewee_Email)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (date, f"{start_time}-{end_time}", interviewee_id, interviewer_id, interviewer_email,
+                          interviewee_email))
+                results.append(claimed)
+        return results
+
+    def release(self, interviewer_id, date, start_time):
+        """Frees a booked slot, e.g. after a cancellation. Returns True if it was booked."""
+        with db.connect() as conn:
+            cursor = conn.execute("""
+                UPDATE interview_slots SET status = 'free', Interviewee_ID = NULL
+                WHERE Interviewer_ID = ? AND date = ? AND start_time = ? AND status != 'free'
+            """, (interviewer_id, date, start_time))
+            return cursor.rowcount == 1
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+
+# The shipped database's tables: INTEGER ids, no primary keys, TEXT ids in interview_schedule
+SCHEMA = """
+CREATE TABLE Interviewee (interviewee_id INTEGER, name TEXT, phone TEXT, email TEXT);
+CREATE TABLE Interviewer (interviewer_id INTEGER, name TEXT, phone TEXT, email TEXT);
+CREATE TABLE Interviewee_Interests (id INTEGER, interviewee_id INTEGER, field_of_interest TEXT);
+CREATE TABLE Interviewer_Expertise (id INTEGER, interviewer_id INTEGER, expertise_field TEXT);
+CREATE TABLE interview_schedule (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Interviewer_ID TEXT,
+    Interviewee_ID TEXT,
+    date TEXT,
+    time TEXT
+);
+"""
+INTERVIEWERS = [(1, "Aerospace"), (2, "Electronics")]
+INTERVIEWEES = [(1, "Aerospace"), (2, "Aerospace"), (3, "Electronics"), (4, "Electronics"),
+                (5, "Aerospace"), (6, "Aerospace"), (7, "Aerospace")]
+
+
+@pytest.fixture
+def integer_id_db(tmp_path, monkeypatch):
+    """A small database with the shipped INTEGER-id schema, configured as db.DB_PATH."""
+    path = str(tmp_path / "drdo.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO Interviewer VALUES (?, ?, '', ?)",
+                     [(i, f"Interviewer {i}", f"interviewer{i}@example.com") for i, _ in INTERVIEWERS])
+    conn.executemany("INSERT INTO Interviewer_Expertise VALUES (?, ?, ?)",
+                     [(i, i, field) for i, field in INTERVIEWERS])
+    conn.executemany("INSERT INTO Interviewee VALUES (?, ?, '', ?)",
+                     [(i, f"Candidate {i}", f"candidate{i}@example.com") for i, _ in INTERVIEWEES])
+    conn.executemany("INSERT INTO Interviewee_Interests VALUES (?, ?, ?)",
+                     [(i, i, field) for i, field in INTERVIEWEES])
+    conn.commit()
+    conn.close()
+
+    # Score snapshots are written to the working directory
+    monkeypatch.chdir(tmp_path)
+    previous = db.DB_PATH
+    db.configure(path)
+    yield path
+    db.close_thread_connections()
+    db.configure(previous)
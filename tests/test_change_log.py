@@ -0,0 +1,67 @@
+import db
+from interview_scheduler import InterviewScheduler
+from slot_calendar import DriveWindow
+
+WINDOW = DriveWindow("2025-05-01", "2025-05-01")
+
+
+def execute(sql, params=()):
+    with db.connect() as conn:
+        conn.execute(sql, params)
+
+
+def test_logs_integer_ids(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    execute("UPDATE Interviewee_Interests SET field_of_interest = 'Electronics' WHERE interviewee_id = 1")
+    with db.connect() as conn:
+        assert conn.execute("SELECT user_id FROM change_log").fetchall() == [(1,)]
+    assert scheduler.change_log.poll() == 1
+
+
+def test_interviewer_edit_recomputes_column(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    assert scheduler.matching_scores.get((1, 2)) == 0
+    execute("UPDATE Interviewer_Expertise SET expertise_field = 'Aerospace' WHERE interviewer_id = 2")
+    scheduler.change_log.poll()
+
+    assert scheduler.change_log.interviewers_refreshed == 1
+    assert scheduler.matching_scores.get((1, 2)) > 0
+    assert scheduler.similarity_scores.get((1, 2)) > 0
+
+
+def test_interviewee_edit_recomputes_row(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    execute("UPDATE Interviewee_Interests SET field_of_interest = 'Electronics' WHERE interviewee_id = 1")
+    scheduler.change_log.poll()
+
+    assert scheduler.change_log.interviewees_refreshed == 1
+    # The 0.6 field-match part of the matching score moved to the Electronics interviewer
+    assert scheduler.matching_scores.get((1, 1)) < 0.6
+    assert scheduler.matching_scores.get((1, 2)) >= 0.6
+
+
+def test_interviewer_edit_keeps_bookings(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    scheduler.schedule_candidates([1, 2, 3])
+    scheduler.store_schedule_in_db()
+    free = scheduler.available_slots.free_by_interviewer()
+    execute("UPDATE Interviewer SET phone = '555' WHERE interviewer_id = 1")
+    scheduler.change_log.poll()
+
+    assert scheduler.available_slots.free_by_interviewer() == free
+
+
+def test_bulk_insert_is_rescored_in_one_batch(integer_id_db, monkeypatch):
+    from dataload import DataLoader
+    from password import insert_candidates
+
+    scheduler = InterviewScheduler(WINDOW)
+    monkeypatch.setattr(DataLoader, "get_skills_for_user", None)  # Per-candidate lookups would fail
+    with db.connect() as conn:
+        insert_candidates(conn, [("CAND0001", "New 1", "n1@example.com", "", "Aerospace"),
+                                 ("CAND0002", "New 2", "n2@example.com", "", "Electronics")])
+    scheduler.change_log.poll()
+
+    assert scheduler.change_log.interviewees_refreshed == 2
+    assert scheduler.matching_scores.get(("CAND0001", 1)) >= 0.6
+    assert scheduler.matching_scores.get(("CAND0002", 2)) >= 0.6
@@ -0,0 +1,15 @@
+import db
+from dataload import DataLoader
+
+
+def test_snapshot_and_ranges_share_row_order(integer_id_db):
+    with db.connect() as conn:
+        # Listed after "Aerospace" but sorting before it
+        conn.execute("INSERT INTO Interviewee_Interests VALUES (8, 1, 'Acoustics')")
+    snapshot = [(row["user_id"], row["core_field"]) for row in DataLoader.get_interviewees()]
+    ranged = [(row["user_id"], row["core_field"])
+              for first, last, _ in DataLoader.iter_interviewee_id_ranges(3)
+              for row in DataLoader.get_interviewees((first, last))]
+
+    assert snapshot == ranged
+    assert snapshot[:2] == [(1, "Aerospace"), (1, "Acoustics")]
@@ -0,0 +1,50 @@
+import sqlite3
+from interview_scheduler import InterviewScheduler
+from slot_calendar import DriveWindow
+
+WINDOW = DriveWindow("2025-05-01", "2025-05-01")
+
+
+def bookings(scheduler):
+    return [(entry["Interviewee_ID"], entry["Interviewer_ID"], entry["Start_Time"]) for entry in scheduler.schedule]
+
+
+def test_parallel_greedy_matches_sequential(integer_id_db, capsys):
+    sequential = InterviewScheduler(WINDOW)
+    sequential.generate_schedule("greedy", workers=1)
+    expected = sorted(bookings(sequential))
+    with sqlite3.connect(integer_id_db) as conn:
+        conn.execute("DELETE FROM interview_schedule")
+
+    parallel = InterviewScheduler(WINDOW)
+    capsys.readouterr()
+    parallel.generate_schedule("greedy", workers=2)
+
+    assert sorted(bookings(parallel)) == expected
+    assert "2 field partitions solved in 1 rounds" in capsys.readouterr().out
+
+
+def test_second_interest_is_tried_in_a_later_round(integer_id_db):
+    with sqlite3.connect(integer_id_db) as conn:
+        conn.execute("INSERT INTO Interviewee_Interests VALUES (8, 4, 'Aerospace')")
+    scheduler = InterviewScheduler(WINDOW)
+    while scheduler.available_slots.claim(2):
+        pass  # Interviewer 2, the only Electronics expert, is fully booked
+
+    scheduler.generate_schedule("greedy", workers=2)
+
+    booked = {candidate_id: interviewer_id for candidate_id, interviewer_id, _ in bookings(scheduler)}
+    assert booked == {1: 1, 2: 1, 5: 1, 6: 1, 7: 1, 4: 1}
+
+
+def test_batch_uses_every_eligible_interviewer(integer_id_db):
+    with sqlite3.connect(integer_id_db) as conn:
+        conn.execute("INSERT INTO Interviewer VALUES (3, 'Interviewer 3', '', 'interviewer3@example.com')")
+        conn.execute("INSERT INTO Interviewer_Expertise VALUES (3, 3, 'Aerospace')")
+    # Two slots per interviewer: the five Aerospace candidates only fit four with both experts
+    scheduler = InterviewScheduler(DriveWindow("2025-05-01", "2025-05-01", day_end="11:00"))
+
+    scheduler.generate_schedule("batch")
+
+    booked = [interviewer_id for _, interviewer_id, _ in bookings(scheduler)]
+    assert sorted(booked) == [1, 1, 2, 2, 3, 3]
@@ -0,0 +1,18 @@
+import sqlite3
+import db
+from password import insert_candidates
+
+
+def test_insert_candidates_numbers_interests_after_max_id(integer_id_db):
+    with db.connect() as conn:
+        insert_candidates(conn, [("CAND0001", "New 1", "n1@example.com", "", "Aerospace"),
+                                 ("CAND0002", "New 2", "n2@example.com", "", "Electronics"),
+                                 (1, "Renamed", "candidate1@example.com", "", "Electronics")])
+        conn.commit()
+
+    with sqlite3.connect(integer_id_db) as conn:
+        interests = conn.execute("SELECT id, interviewee_id, field_of_interest FROM Interviewee_Interests "
+                                 "WHERE id > 7 ORDER BY id").fetchall()
+        names = dict(conn.execute("SELECT interviewee_id, name FROM Interviewee"))
+    assert interests == [(8, "CAND0001", "Aerospace"), (9, "CAND0002", "Electronics"), (10, 1, "Electronics")]
+    assert names[1] == "Renamed" and len(names) == 9
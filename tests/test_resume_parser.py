@@ -0,0 +1,92 @@
+import pytest
+import resume_parser
+from resume_parser import ResumeParserService
+
+FIRST_PAGE = "Name: Asha Rao\nasha@example.com\nGATE Score\nScore: 720\nB.Tech in Aerospace Engineering\n"
+SECOND_PAGE = "Phone: 987-654-3210\n3 years of experience in avionics\n"
+
+
+class FakeResumeParser:
+    calls = []
+
+    def __init__(self, file_path):
+        FakeResumeParser.calls.append(file_path)
+
+    def get_extracted_data(self):
+        return {"mobile_number": "9000000000", "total_experience": 1}
+
+
+@pytest.fixture
+def pdf_pages(monkeypatch):
+    """Serves the given page texts in place of a PDF and records pyresparser calls."""
+    def serve(*texts):
+        def iter_pdf_pages(file_path, trace):
+            trace["pages_total"] = len(texts)
+            for text in texts:
+                trace["pages_read"] += 1
+                yield text
+        monkeypatch.setattr(ResumeParserService, "iter_pdf_pages", staticmethod(iter_pdf_pages))
+    FakeResumeParser.calls = []
+    monkeypatch.setattr(resume_parser, "ResumeParser", FakeResumeParser)
+    monkeypatch.setattr(ResumeParserService, "nlp_available", True)
+    return serve
+
+
+def test_regexes_read_later_pages_before_nlp(pdf_pages):
+    pdf_pages(FIRST_PAGE, SECOND_PAGE)
+
+    parsed = ResumeParserService.parse_resume("resume.pdf", min_gate_score=500)
+
+    assert FakeResumeParser.calls == []
+    assert parsed["phone"] == "987-654-3210"
+    assert parsed["experience"] == 3.0
+    assert parsed["extraction"]["pages_read"] == 2
+
+
+def test_nlp_fills_only_what_the_regexes_missed(pdf_pages):
+    pdf_pages(FIRST_PAGE, "3 years of experience in avionics\n")
+
+    parsed = ResumeParserService.parse_resume("resume.pdf")
+
+    assert FakeResumeParser.calls == ["resume.pdf"]
+    assert parsed["extraction"]["nlp_fields"] == ["phone"]
+    assert parsed["phone"] == "9000000000"
+    assert parsed["experience"] == 3.0
+
+
+def test_low_gate_score_skips_the_remaining_pages(pdf_pages):
+    pdf_pages(FIRST_PAGE.replace("720", "300"), SECOND_PAGE)
+
+    parsed = ResumeParserService.parse_resume("resume.pdf", min_gate_score=500)
+
+    assert parsed["extraction"]["rejected_early"]
+    assert parsed["extraction"]["pages_read"] == 1
+    assert FakeResumeParser.calls == []
+
+
+def test_short_keywords_inside_words_do_not_count():
+    # "it", "cs" and "md" appear inside these words, and "mech"/"chem" inside "mechanics"/"chemistry"
+    text = "Credits: economics, admit card, humdrum mechanics and chemistry with it"
+
+    assert ResumeParserService.classify_core_field(text) == {}
+    assert ResumeParserService.extract_core_field(text) == resume_parser.DEFAULT_CORE_FIELD
+
+
+def test_acronyms_count_only_in_capitals():
+    assert ResumeParserService.classify_core_field("IT and CSE graduate") == {
+        "Computer Science": {"hits": 2, "specificity": 1}}
+    assert ResumeParserService.classify_core_field("it and cse graduate") == {}
+
+
+def test_multi_word_keyword_is_one_match():
+    assert ResumeParserService.classify_core_field("M.Sc. Applied\n  Physics") == {
+        "Physics": {"hits": 1, "specificity": 2}}
+
+
+def test_hits_decide_before_specificity_then_field_order():
+    # Two plain hits beat one two-word keyword
+    assert ResumeParserService.extract_core_field("Aerospace, avionics and computer science") == "Aerospace"
+    # Equal hits: the more specific keyword wins
+    assert ResumeParserService.extract_core_field("aerospace, computer science") == "Computer Science"
+    # Equal hits and specificity: the field listed first in FIELD_KEYWORDS wins
+    assert ResumeParserService.extract_core_field("Civil and Mechanical") == "Mechanical"
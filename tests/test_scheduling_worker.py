@@ -0,0 +1,55 @@
+from interview_scheduler import InterviewScheduler
+from scheduling_worker import SchedulingWorker
+from slot_calendar import DriveWindow
+
+WINDOW = DriveWindow("2025-05-01", "2025-05-01")
+
+
+def test_failed_batch_is_retried_one_by_one(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    update_scores = scheduler.update_scores_for_candidates
+
+    def failing_update(batch):
+        if any(candidate_id == 99 for candidate_id, _ in batch):
+            raise RuntimeError("bad candidate")
+        update_scores(batch)
+
+    scheduler.update_scores_for_candidates = failing_update
+    worker = SchedulingWorker(scheduler, batch_wait=1)
+    scheduled, failed = [], []
+    worker.on_scheduled = scheduled.extend
+    worker.on_failed = failed.extend
+    worker.start()
+    for candidate in [(1, "Aerospace"), (99, "Aerospace"), (3, "Electronics")]:
+        worker.submit(*candidate)
+    worker.join()
+
+    assert sorted(scheduled) == [1, 3]
+    assert failed == [99]
+    assert (worker.processed, worker.failed) == (2, 1)
+
+
+def test_failure_after_claims_does_not_book_twice(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    confirm_claims = scheduler._confirm_claims
+    calls = []
+
+    def failing_confirm(first_booking):
+        calls.append(first_booking)
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return confirm_claims(first_booking)
+
+    scheduler._confirm_claims = failing_confirm
+    free = scheduler.available_slots.total_free()
+    worker = SchedulingWorker(scheduler, batch_wait=1)
+    scheduled = []
+    worker.on_scheduled = scheduled.extend
+    worker.start()
+    for candidate in [(1, "Aerospace"), (2, "Aerospace")]:
+        worker.submit(*candidate)
+    worker.join()
+
+    assert sorted(scheduled) == [1, 2]
+    # The discarded bookings' slots were given back before the retry
+    assert scheduler.available_slots.total_free() == free - 2
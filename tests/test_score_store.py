@@ -0,0 +1,32 @@
+import json
+import numpy as np
+from score_store import ScoreSnapshot, ScoreStore
+
+
+def test_snapshot_round_trip(tmp_path):
+    snapshot = ScoreSnapshot(str(tmp_path))
+    similarity = ScoreStore.from_pairs({(1, 10): 0.5, ("CAND0001", 20): 0.25}, [10, 20])
+    matching = ScoreStore.from_pairs({(1, 20): 0.75}, [10, 20])
+    snapshot.save("fingerprint-1", {"similarity": similarity, "matching": matching})
+    saved = (tmp_path / "similarity.npy").read_bytes()
+
+    stores = snapshot.load("fingerprint-1")
+    loaded = stores["similarity"]
+    assert list(loaded.row_index) == [1, "CAND0001"] and list(loaded.column_index) == [10, 20]
+    np.testing.assert_array_equal(loaded.values, similarity.values)
+    assert stores["matching"][1, 20] == 0.75
+
+    # Copy-on-write: in-place updates stay in memory and never reach the file
+    loaded.update_row(1, np.array([0, 1]), np.array([0.9, 0.8], dtype=np.float32))
+    assert loaded[1, 20] == np.float32(0.8)
+    assert (tmp_path / "similarity.npy").read_bytes() == saved
+    assert snapshot.load("fingerprint-1")["similarity"][1, 20] == 0
+
+    # Another fingerprint means the source tables changed
+    assert snapshot.load("fingerprint-2") is None
+
+    # A manifest whose ids don't match the array's shape is rejected
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    manifest["stores"]["similarity"]["rows"].append(2)
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    assert snapshot.load("fingerprint-1") is None
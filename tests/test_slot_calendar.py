@@ -0,0 +1,75 @@
+from slot_calendar import DriveWindow, SlotCalendar
+
+WINDOW = DriveWindow("2025-05-01", "2025-05-02")
+SLOTS_PER_DAY = 12
+
+
+def calendar(interviewer_ids=(1, 2)):
+    starts, ends = WINDOW.day_template()
+    return SlotCalendar(interviewer_ids, WINDOW.days(), starts, ends)
+
+
+def start(slot):
+    return (slot["Date"], slot["Start_Time"])
+
+
+def test_claim_takes_the_earliest_free_slot():
+    slots = calendar()
+    assert slots.claim(1) == {"Date": "2025-05-01", "Start_Time": "10:00", "End_Time": "10:30"}
+    assert start(slots.claim(1)) == ("2025-05-01", "10:30")
+    assert slots.free_slots(1) == 2 * SLOTS_PER_DAY - 2
+    assert slots.free_slots(2) == 2 * SLOTS_PER_DAY
+    assert slots.claim(3) is None
+
+
+def test_claim_returns_none_once_full():
+    slots = calendar()
+    claimed = [slots.claim(1) for _ in range(2 * SLOTS_PER_DAY)]
+    assert start(claimed[-1]) == ("2025-05-02", "16:04")
+    assert slots.claim(1) is None
+    assert slots.next_free_slot(1) is None
+
+
+def test_release_then_claim_returns_the_released_slot():
+    slots = calendar()
+    for _ in range(3):
+        slots.claim(1)
+    assert slots.release(1, "2025-05-01", "10:30")
+    assert not slots.release(1, "2025-05-01", "10:30")
+    assert not slots.release(1, "2025-05-01", "10:15")
+    # The earliest-free pointer moved back to the released slot
+    assert start(slots.next_free_slot(1)) == ("2025-05-01", "10:30")
+    assert start(slots.claim(1)) == ("2025-05-01", "10:30")
+    assert start(slots.claim(1)) == ("2025-05-01", "11:32")
+
+
+def test_next_free_slot_at_or_after_a_time_does_not_claim():
+    slots = calendar()
+    slots.mark_taken(1, "2025-05-01", "13:32")
+    assert start(slots.next_free_slot(1, "2025-05-01", "13:00")) == ("2025-05-01", "14:02")
+    assert start(slots.next_free_slot(1, "2025-05-01", "16:30")) == ("2025-05-02", "10:00")
+    assert start(slots.next_free_slot(1, "2025-05-02")) == ("2025-05-02", "10:00")
+    assert slots.next_free_slot(1, "2025-06-01") is None
+    assert start(slots.claim(1, "2025-05-01", "13:00")) == ("2025-05-01", "14:02")
+    assert slots.free_slots(1) == 2 * SLOTS_PER_DAY - 2
+
+
+def test_mark_taken_many_skips_unknown_entries():
+    slots = calendar()
+    slots.mark_taken_many(
+        [1, 1, 2, 3, 1, 1],
+        ["2025-05-01", "2025-05-01", "2025-05-02", "2025-05-01", "2025-06-01", "2025-05-01"],
+        ["10:00", "11:00", "16:04", "10:00", "10:00", "10:15"],
+    )
+    assert slots.free_by_interviewer() == {1: 2 * SLOTS_PER_DAY - 2, 2: 2 * SLOTS_PER_DAY - 1}
+    assert start(slots.claim(1)) == ("2025-05-01", "10:30")
+    assert start(slots.claim(1)) == ("2025-05-01", "11:32")
+    assert start(slots.claim(2)) == ("2025-05-01", "10:00")
+
+
+def test_subset_is_independent():
+    slots = calendar()
+    sub = slots.subset([2])
+    sub.claim(2)
+    assert sub.free_slots(2) == 2 * SLOTS_PER_DAY - 1
+    assert slots.free_slots(2) == 2 * SLOTS_PER_DAY
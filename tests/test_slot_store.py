@@ -0,0 +1,50 @@
+import sqlite3
+from interview_scheduler import InterviewScheduler
+from slot_calendar import DriveWindow
+
+WINDOW = DriveWindow("2025-05-01", "2025-05-01")
+
+
+def test_restart_keeps_booked_slots(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    free = scheduler.available_slots.total_free()
+    scheduler.schedule_candidates([1, 2, 3, 4])
+    assert len(scheduler.schedule) == 4
+    assert scheduler.store_schedule_in_db() == 4
+
+    restarted = InterviewScheduler(WINDOW)
+    assert restarted.available_slots.total_free() == free - 4
+    assert restarted.available_slots.free_slots(1) == scheduler.available_slots.free_slots(1)
+
+
+def test_lost_claim_resyncs_calendar(integer_id_db):
+    first = InterviewScheduler(WINDOW)
+    second = InterviewScheduler(WINDOW)
+    first.schedule_candidates([1, 2, 5, 6])
+    next_free = first.available_slots.next_free_slot(1)
+    # second's calendar still shows all of interviewer 1's slots as free
+    second.schedule_candidates([7])
+
+    assert [(entry["Interviewee_ID"], entry["Start_Time"]) for entry in second.schedule] == [(7, next_free["Start_Time"])]
+    assert second.available_slots.free_slots(1) == first.available_slots.free_slots(1) - 1
+
+
+def test_claims_write_their_schedule_rows(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    scheduler.schedule_candidates([1, 2, 3])
+    # Never stored: the rows were written with the claims
+    with sqlite3.connect(integer_id_db) as conn:
+        rows = conn.execute("SELECT COUNT(*) FROM interview_schedule").fetchone()[0]
+        booked = conn.execute("SELECT COUNT(*) FROM interview_slots WHERE status = 'booked'").fetchone()[0]
+    assert rows == booked == 3
+
+
+def test_restart_frees_booked_slots_without_schedule_row(integer_id_db):
+    scheduler = InterviewScheduler(WINDOW)
+    free = scheduler.available_slots.total_free()
+    scheduler.schedule_candidates([1, 2])
+    with sqlite3.connect(integer_id_db) as conn:
+        conn.execute("DELETE FROM interview_schedule WHERE Interviewee_ID = '1'")
+
+    restarted = InterviewScheduler(WINDOW)
+    assert restarted.available_slots.total_free() == free - 1
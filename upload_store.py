@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import db
+
+UPLOAD_FOLDER = "uploads"
+CHUNK_SIZE = 1 << 16
+# Total size of the cached parse results; the least recently used are evicted past it
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+# Bump when parse_resume changes what it extracts, so older cached results stop matching
+PARSER_VERSION = 2
+# parse_resume output that is per-run rather than a property of the file
+VOLATILE_KEYS = ("full_text", "extraction")
+
+
+class UploadStore:
+    """Resume uploads stored once per distinct content, named by SHA-256.
+
+    The file lives at `<folder>/blobs/<sha256>.pdf`. The name an upload arrived under
+    (e.g. `CAND0001_1742754203_prakash.pdf`) is only a row in `upload_refs` pointing at
+    the hash, so a resubmitted resume costs one hash and no new file.
+    """
+
+    def __init__(self, folder=UPLOAD_FOLDER):
+        self.blob_folder = os.path.join(folder, "blobs")
+        os.makedirs(self.blob_folder, exist_ok=True)
+        with db.connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS upload_refs (
+                    reference TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_upload_refs_hash ON upload_refs(content_hash)")
+
+    def path_for(self, content_hash):
+        return os.path.join(self.blob_folder, f"{content_hash}.pdf")
+
+    def save(self, stream, reference):
+        """Stores a file-like upload under its content hash and records `reference`; returns (content_hash, path)."""
+        digest, size = hashlib.sha256(), 0
+        fd, temp_path = tempfile.mkstemp(dir=self.blob_folder, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            content_hash = digest.hexdigest()
+            path = self.path_for(content_hash)
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        with db.connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO upload_refs (reference, content_hash, size) VALUES (?, ?, ?)",
+                (reference, content_hash, size)
+            )
+        return content_hash, path
+
+
+class ParseCache:
+    """parse_resume results keyed by the resume's content hash, in the `parse_cache` table.
+
+    Entries are JSON without the volatile parts and are evicted least recently used first
+    once their total size passes `max_bytes`. A result that stopped early at the GATE check
+    is only reused by callers applying a threshold it fails.
+    """
+
+    def __init__(self, max_bytes=PARSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+        with db.connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    content_hash TEXT PRIMARY KEY,
+                    parser_version INTEGER NOT NULL,
+                    rejected_early INTEGER NOT NULL,
+                    result TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+    def get(self, content_hash, min_gate_score=None):
+        """The cached result for `content_hash` usable with `min_gate_score`, or None."""
+        with db.connect() as conn:
+            row = conn.execute(
+                "SELECT rejected_early, result FROM parse_cache WHERE content_hash = ? AND parser_version = ?",
+                (content_hash, PARSER_VERSION)
+            ).fetchone()
+            parsed_data = json.loads(row[1]) if row else None
+            if parsed_data is not None and row[0] and (
+                    min_gate_score is None or parsed_data.get("gate_score", 0) >= min_gate_score):
+                parsed_data = None  # Missing the fields this caller needs
+            if parsed_data is not None:
+                conn.execute("UPDATE parse_cache SET last_used_at = CURRENT_TIMESTAMP WHERE content_hash = ?",
+                             (content_hash,))
+        with self._lock:
+            if parsed_data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return parsed_data
+
+    def put(self, content_hash, parsed_data):
+        """Caches a parse_resume result; failed parses (empty results) are not cached."""
+        if not parsed_data or "extraction" not in parsed_data:
+            return
+        result = json.dumps({key: value for key, value in parsed_data.items() if key not in VOLATILE_KEYS},
+                            default=str)
+        with db.connect() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO parse_cache (content_hash, parser_version, rejected_early, result, size)
+                VALUES (?, ?, ?, ?, ?)
+            """, (content_hash, PARSER_VERSION, parsed_data["extraction"]["rejected_early"], result, len(result)))
+            evicted = conn.execute("""
+                DELETE FROM parse_cache WHERE content_hash IN (
+                    SELECT content_hash FROM (
+                        SELECT content_hash,
+                               SUM(size) OVER (ORDER BY last_used_at DESC, rowid DESC) AS running_size
+                        FROM parse_cache
+                    ) WHERE running_size > ?
+                )
+            """, (self.max_bytes,)).rowcount
+        if evicted:
+            with self._lock:
+                self.evicted += evicted
+
+    def metrics(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evicted": self.evicted,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,69 @@
+import threading
+import time
+
+class Warmup:
+    """Initializes slow components on a background thread and reports their progress.
+
+    Components run in the order they were added, so a later one may rely on an
+    earlier one. Request handlers fetch a component with `get`, optionally waiting
+    for it, while everything that doesn't need it is served straight away.
+    """
+
+    def __init__(self):
+        self._steps = []
+        self._events = {}
+        self._results = {}
+        self.status = {}
+        self.timings = {}
+        self.errors = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def add(self, name, init):
+        self._steps.append((name, init))
+        self._events[name] = threading.Event()
+        self.status[name] = "pending"
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        for name, init in self._steps:
+            self.status[name] = "running"
+            started = time.perf_counter()
+            try:
+                self._results[name] = init()
+                self.status[name] = "ready"
+                print(f"✅ Warm-up: {name} ready")
+            except Exception as e:
+                self.errors[name] = str(e)
+                self.status[name] = "failed"
+                print(f"❌ Warm-up: {name} failed: {e}")
+            self.timings[name] = round(time.perf_counter() - started, 4)
+            self._events[name].set()
+
+    def get(self, name, timeout=0):
+        """Returns the component once initialized, or None if it failed or isn't ready within `timeout` seconds."""
+        self.start()
+        if not self._events[name].wait(timeout):
+            return None
+        return self._results.get(name)
+
+    def is_ready(self):
+        return all(state == "ready" for state in self.status.values())
+
+    def report(self):
+        return {
+            "ready": self.is_ready(),
+            "components": {
+                name: {
+                    "status": self.status[name],
+                    "seconds": self.timings.get(name),
+                    "error": self.errors.get(name),
+                }
+                for name, _ in self._steps
+            },
+        }